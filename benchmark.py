@@ -0,0 +1,537 @@
+import json
+import os
+import sys
+import time
+import random
+import shutil
+import platform
+import argparse
+import tempfile
+import contextlib
+from datetime import datetime
+from pathlib import Path
+from html.parser import HTMLParser
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Configuration
+FIXTURE_DIR = Path("bench_fixtures")
+PLAYSTORE_FIXTURE = FIXTURE_DIR / "playstore_reviews_irctc.json"
+REDDIT_SEARCH_FIXTURE = FIXTURE_DIR / "reddit_search.json"
+REDDIT_THREAD_FIXTURE = FIXTURE_DIR / "reddit_thread.json"
+QUORA_FIXTURE = FIXTURE_DIR / "quora_search.html"
+REVIEWS_DIR = Path("playstore_reviews")
+
+REQUIREMENTS_FILE = "requirements.txt"
+RESULTS_FILE = "bench_results.json"
+# Committed reference run. Re-record it with --save-baseline whenever a change is
+# meant to move the numbers, and commit the new file with that change.
+BASELINE_FILE = "bench_baseline.json"
+SCALES = [10, 100, 1000]  # Synthetic corpus sizes, as multiples of playstore_reviews
+REPEATS = 20  # Calls per benchmark for the fast, whole-call benchmarks
+MAX_LATENCY_SAMPLES = 10000  # Latencies kept per benchmark for p50/p99
+REGRESSION_THRESHOLD = 0.20  # Allowed slowdown against the baseline
+# Sub-millisecond p99s jitter by more than the threshold from run to run, so p99 only
+# fails a run with enough samples and when it is also this much slower in absolute terms
+P99_MIN_SAMPLES = 1000
+P99_FLOOR_MS = 0.25
+BASELINE_RUNS = 3  # Fresh-process runs per benchmark whose median --save-baseline records
+RECHECK_RUNS = 2  # Re-runs a regressed benchmark gets; it only fails if every one regresses too
+SEED = 42
+
+QUORA_QUESTION_SELECTOR = "div.q-box.qu-display--block"
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+def load_playstore_fixture():
+    """Load the recorded google_play_scraper responses, restoring datetimes."""
+    with open(PLAYSTORE_FIXTURE, 'r', encoding='utf-8') as f:
+        fixture = json.load(f)
+    for page in fixture['pages']:
+        for review in page:
+            for key in ('at', 'repliedAt'):
+                if review.get(key):
+                    review[key] = datetime.fromisoformat(review[key])
+    return fixture
+
+def load_json_fixture(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def load_review_contents():
+    """Collect the review texts from every file in playstore_reviews."""
+    contents = []
+    for file_path in sorted(REVIEWS_DIR.glob('reviews_*.json')):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        contents.extend(r.get('content') or '' for r in data.get('reviews', []))
+    return contents
+
+def synthetic_reviews(contents, scale):
+    """Yield a corpus `scale` times the size of playstore_reviews without materialising it.
+
+    Every copy after the first gets a light, deterministic perturbation so repeated
+    texts do not hit any caches in the code under test.
+    """
+    rng = random.Random(SEED)
+    for copy in range(scale):
+        for text in contents:
+            if copy and text:
+                cut = rng.randrange(len(text))
+                text = f"{text[cut:]} {text[:cut]} #{copy}"
+            yield text
+
+class FixtureReviews:
+    """Stand-in for google_play_scraper.reviews that replays recorded pages."""
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    def __call__(self, app_id, lang='en', country='us', sort=None, count=100,
+                 filter_score_with=None, continuation_token=None, **kwargs):
+        page = continuation_token or 0
+        if page >= len(self.pages):
+            return [], page
+        return list(self.pages[page]), page + 1
+
+class FixtureElement:
+    """Minimal WebElement replacement built from saved Quora HTML."""
+
+    def __init__(self, tag, attrs, parent=None):
+        self.tag = tag
+        self.attrs = dict(attrs)
+        self.classes = set((self.attrs.get('class') or '').split())
+        self.parent = parent
+        self.children = []
+        self.parts = []
+
+    @property
+    def text(self):
+        return " ".join(" ".join(self._iter_text()).split())
+
+    def _iter_text(self):
+        yield from self.parts
+        for child in self.children:
+            yield from child._iter_text()
+
+    def get_attribute(self, name):
+        return self.attrs.get(name)
+
+    def matches(self, selector):
+        tag, _, classes = selector.partition('.')
+        if tag and tag != self.tag:
+            return False
+        return all(c in self.classes for c in classes.split('.') if c)
+
+    def iter_descendants(self):
+        for child in self.children:
+            yield child
+            yield from child.iter_descendants()
+
+    def find_elements(self, by, selector):
+        return [e for e in self.iter_descendants() if e.matches(selector)]
+
+    def find_element(self, by, selector):
+        for element in self.iter_descendants():
+            if element.matches(selector):
+                return element
+        from selenium.common.exceptions import NoSuchElementException
+        raise NoSuchElementException(f"Unable to locate element: {selector}")
+
+class FixtureHTMLParser(HTMLParser):
+    """Build a FixtureElement tree from a saved page."""
+
+    VOID_TAGS = {'meta', 'link', 'img', 'br', 'hr', 'input'}
+
+    def __init__(self):
+        super().__init__()
+        self.root = FixtureElement('document', [])
+        self.current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        element = FixtureElement(tag, attrs, self.current)
+        self.current.children.append(element)
+        if tag not in self.VOID_TAGS:
+            self.current = element
+
+    def handle_endtag(self, tag):
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        self.current.parts.append(data)
+
+def load_quora_question_elements():
+    """Parse the saved Quora search page into its outermost question cards."""
+    parser = FixtureHTMLParser()
+    with open(QUORA_FIXTURE, 'r', encoding='utf-8') as f:
+        parser.feed(f.read())
+    cards = []
+    for element in parser.root.find_elements(None, QUORA_QUESTION_SELECTOR):
+        parent = element.parent
+        while parent is not None and not parent.matches(QUORA_QUESTION_SELECTOR):
+            parent = parent.parent
+        if parent is None:
+            cards.append(element)
+    return cards
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def peak_rss_kb():
+    """Peak resident set size of the current process in kilobytes."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def dependency_versions():
+    """Installed version of every package in requirements.txt, or None if it is missing."""
+    from importlib import metadata
+
+    versions = {}
+    with open(REQUIREMENTS_FILE, 'r', encoding='utf-8') as f:
+        for line in f:
+            name = line.split('#')[0].strip()
+            for separator in ('==', '>=', '<=', '~=', '>', '<'):
+                name = name.split(separator)[0].strip()
+            if not name:
+                continue
+            try:
+                versions[name] = metadata.version(name)
+            except metadata.PackageNotFoundError:
+                versions[name] = None
+    return versions
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def measure(func, calls, units_per_call=1, total_calls=None):
+    """Time func over every argument in `calls` and summarise the run.
+
+    Latency is sampled at a fixed stride so very long runs keep a bounded sample
+    list and do not distort the peak RSS they are reporting.
+    """
+    stride = max(1, (total_calls or 0) // MAX_LATENCY_SAMPLES)
+    latencies = []
+    ops = 0
+    clock = time.perf_counter
+    started = clock()
+    for args in calls:
+        call_started = clock()
+        func(*args)
+        elapsed = clock() - call_started
+        if ops % stride == 0:
+            latencies.append(elapsed)
+        ops += 1
+    total = clock() - started
+    units = ops * units_per_call
+    return {
+        'ops': ops,
+        'units': units,
+        'total_s': round(total, 6),
+        'throughput_per_s': round(units / total, 2) if total else None,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 6),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 6),
+        'samples': len(latencies),
+    }
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the scrapers' per-review progress output while timing."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+@contextlib.contextmanager
+def working_directory(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+def bench_format_review():
+    import play_store
+
+    fixture = load_playstore_fixture()
+    raw_reviews = [review for page in fixture['pages'] for review in page]
+    calls = [(review,) for _ in range(REPEATS) for review in raw_reviews]
+    return measure(play_store.format_review, calls)
+
+def bench_scrape_app_reviews():
+    import google_play_scraper
+    import play_store
+
+    fixture = load_playstore_fixture()
+    replay = FixtureReviews(fixture['pages'])
+    fetched = sum(len(page) for page in fixture['pages'])
+    with tempfile.TemporaryDirectory() as tmp:
+        # play_store imports these at call time, so the replay is patched on the library
+        google_play_scraper.reviews = replay
+        google_play_scraper.app = lambda app_id, **kwargs: fixture['app_info']
+        play_store.REQUEST_DELAY = 0
+        play_store.OUTPUT_DIR = tmp
+        play_store.APP_IDS = {fixture['app_name']: fixture['app_id']}
+        calls = [(fixture['app_name'], fixture['app_id'])] * REPEATS
+        with quiet():
+            return measure(play_store.scrape_app_reviews, calls, units_per_call=fetched)
+
+def bench_stream_app_reviews():
+    import google_play_scraper
+    import play_store
+    import pipeline
+
+    fixture = load_playstore_fixture()
+    fetched = sum(len(page) for page in fixture['pages'])
+    with tempfile.TemporaryDirectory() as tmp:
+        google_play_scraper.reviews = FixtureReviews(fixture['pages'])
+        play_store.REQUEST_DELAY = 0
+        pipeline.OUTPUT_DIR = tmp
+
+        def stream_once(app_name, app_id):
+            # Start from an empty store each time so every run does the full work
+            stream_file = pipeline.get_stream_file(app_name)
+            if os.path.exists(stream_file):
+                os.remove(stream_file)
+            pipeline.StreamingPipeline(app_name, app_id).run()
+
+        calls = [(fixture['app_name'], fixture['app_id'])] * REPEATS
+        with quiet():
+            return measure(stream_once, calls, units_per_call=fetched)
+
+def bench_clean_text():
+    import clean_reviews
+
+    contents = load_review_contents()
+    return measure(clean_reviews.clean_text, [(text,) for text in contents])
+
+def bench_process_reviews_file():
+    import clean_reviews
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source_dir = Path(tmp) / 'playstore_reviews'
+        source_dir.mkdir()
+        source = source_dir / 'reviews_irctc.json'
+        shutil.copy(REVIEWS_DIR / 'reviews_irctc.json', source)
+        with open(source, 'r', encoding='utf-8') as f:
+            review_count = len(json.load(f)['reviews'])
+        with working_directory(tmp), quiet():
+            return measure(clean_reviews.process_reviews_file, [(source,)] * REPEATS,
+                           units_per_call=review_count)
+
+def bench_extract_reddit_conversation():
+    import reddit
+
+    thread = load_json_fixture(REDDIT_THREAD_FIXTURE)
+    search = load_json_fixture(REDDIT_SEARCH_FIXTURE)
+    # Replay the thread once per post in the recorded search listing
+    calls = [(thread,) for _ in range(REPEATS) for _ in search['data']['children']]
+    return measure(reddit.extract_reddit_conversation, calls)
+
+def bench_extract_question_data():
+    import quora_scraper
+
+    elements = load_quora_question_elements()
+    calls = [(element,) for _ in range(REPEATS) for element in elements]
+    with quiet():
+        return measure(quora_scraper.extract_question_data, calls)
+
+def bench_synthetic_clean_text(scale):
+    import clean_reviews
+
+    contents = load_review_contents()
+    calls = ((text,) for text in synthetic_reviews(contents, scale))
+    return measure(clean_reviews.clean_text, calls, total_calls=len(contents) * scale)
+
+BENCHMARKS = {
+    'format_review': bench_format_review,
+    'scrape_app_reviews': bench_scrape_app_reviews,
+    'stream_app_reviews': bench_stream_app_reviews,
+    'clean_text': bench_clean_text,
+    'process_reviews_file': bench_process_reviews_file,
+    'extract_reddit_conversation': bench_extract_reddit_conversation,
+    'extract_question_data': bench_extract_question_data,
+}
+
+def run_benchmark(name, scale=None):
+    """Run one benchmark; called in a fresh worker process so peak RSS is its own."""
+    random.seed(SEED)
+    if scale is None:
+        result = BENCHMARKS[name]()
+    else:
+        result = bench_synthetic_clean_text(scale)
+    result['peak_rss_kb'] = peak_rss_kb()
+    return result
+
+def run_isolated(name, scale=None):
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(run_benchmark, name, scale).result()
+
+def median_result(results):
+    """One result whose timings and peak RSS are the medians over several runs."""
+    merged = dict(results[0], runs=len(results))
+    for key in ('total_s', 'throughput_per_s', 'p50_ms', 'p99_ms', 'peak_rss_kb'):
+        if key not in merged:
+            continue
+        values = sorted(r[key] for r in results if r.get(key) is not None)
+        merged[key] = values[len(values) // 2] if values else None
+    return merged
+
+def run_repeated(name, scale=None, runs=1):
+    """Run a benchmark `runs` times, each in a fresh process, and keep the median."""
+    results = [run_isolated(name, scale) for _ in range(runs)]
+    return results[0] if runs == 1 else median_result(results)
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def compare_to_baseline(results, baseline, threshold):
+    """Return (regressions, unchecked): human-readable regressions, and benchmarks the baseline lacks."""
+    regressions = []
+    unchecked = []
+    for name, result in results.items():
+        base = baseline.get('benchmarks', {}).get(name)
+        if not base:
+            unchecked.append(name)
+            continue
+        regressions.extend(benchmark_regressions(name, result, base, threshold))
+    return regressions, unchecked
+
+def benchmark_regressions(name, result, base, threshold):
+    """Human-readable regressions of one benchmark's result against its baseline entry."""
+    regressions = []
+    if base.get('throughput_per_s') and result.get('throughput_per_s') is not None:
+        floor = base['throughput_per_s'] * (1 - threshold)
+        if result['throughput_per_s'] < floor:
+            regressions.append(f"{name}: throughput {result['throughput_per_s']}/s "
+                               f"vs baseline {base['throughput_per_s']}/s")
+    if base.get('p99_ms') and result.get('samples', 0) >= P99_MIN_SAMPLES:
+        ceiling = max(base['p99_ms'] * (1 + threshold), base['p99_ms'] + P99_FLOOR_MS)
+        if result['p99_ms'] > ceiling:
+            regressions.append(f"{name}: p99 {result['p99_ms']}ms vs baseline {base['p99_ms']}ms")
+    if base.get('peak_rss_kb') and result.get('peak_rss_kb'):
+        ceiling = base['peak_rss_kb'] * (1 + threshold)
+        if result['peak_rss_kb'] > ceiling:
+            regressions.append(f"{name}: peak RSS {result['peak_rss_kb']}KB "
+                               f"vs baseline {base['peak_rss_kb']}KB")
+    return regressions
+
+def confirm_regressions(results, plan, baseline, threshold, runs=RECHECK_RUNS):
+    """Re-run each regressed benchmark; keep the first re-run that passes in results.
+
+    Timing noise on a shared machine can exceed the threshold for one run, so
+    a benchmark only counts as regressed when every re-run regresses as well.
+    """
+    scales = dict(plan)
+    for name, result in results.items():
+        base = baseline.get('benchmarks', {}).get(name)
+        if not base or not benchmark_regressions(name, result, base, threshold):
+            continue
+        for attempt in range(1, runs + 1):
+            print(f"Re-running {name} to confirm a regression ({attempt}/{runs})...")
+            rerun = run_isolated(name, scales[name])
+            if not benchmark_regressions(name, rerun, base, threshold):
+                results[name] = rerun
+                break
+
+def save_report(report, output_file):
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=4)
+    print(f"\nSaved results to {output_file}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the scraping and cleaning pipeline.")
+    parser.add_argument('--only', nargs='+', metavar='NAME',
+                        help="Run only these benchmarks (use synthetic_clean_text_<N>x for scaled corpora)")
+    parser.add_argument('--scales', type=int, nargs='*', default=SCALES,
+                        help="Synthetic corpus multipliers (default: %(default)s)")
+    parser.add_argument('--output', default=RESULTS_FILE, help="Where to write the results JSON")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="Baseline results to compare against")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="Store this run as the new baseline instead of comparing (commit the result)")
+    parser.add_argument('--runs', type=int,
+                        help="Fresh-process runs per benchmark, keeping the median "
+                             f"(default: {BASELINE_RUNS} with --save-baseline, otherwise 1)")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="Allowed relative slowdown before a result counts as a regression")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    plan = [(name, None) for name in BENCHMARKS]
+    plan += [(f"synthetic_clean_text_{scale}x", scale) for scale in args.scales]
+    if args.only:
+        plan = [(name, scale) for name, scale in plan if name in args.only]
+
+    runs = args.runs or (BASELINE_RUNS if args.save_baseline else 1)
+    results = {}
+    for name, scale in plan:
+        print(f"Running {name}...")
+        result = run_repeated(name, scale, runs)
+        results[name] = result
+        print(f"  {result['throughput_per_s']}/s, p50 {result['p50_ms']}ms, "
+              f"p99 {result['p99_ms']}ms, peak RSS {result['peak_rss_kb']}KB")
+
+    report = {
+        'generated_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'dependencies': dependency_versions(),
+        'benchmarks': results,
+    }
+
+    output_file = args.baseline if args.save_baseline else args.output
+    save_report(report, output_file)
+
+    if args.save_baseline:
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 2
+
+    baseline = load_json_fixture(args.baseline)
+    print(f"Comparing against {args.baseline} from {baseline.get('generated_at')} "
+          f"(Python {baseline.get('python')}, {baseline.get('platform')})")
+    if baseline.get('dependencies') != report['dependencies']:
+        # Timings and memory depend on these (emoji alone adds ~17MB), so say why numbers may differ
+        print(f"Warning: installed dependencies {report['dependencies']} differ from the baseline's "
+              f"{baseline.get('dependencies')}")
+    confirm_regressions(results, plan, baseline, args.threshold)
+    save_report(report, output_file)
+    regressions, unchecked = compare_to_baseline(results, baseline, args.threshold)
+    if unchecked:
+        print(f"Not in the baseline, so not checked: {', '.join(unchecked)}")
+        if len(unchecked) == len(results):
+            return 2
+    if regressions:
+        print("\nPerformance regressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print("\nNo regressions against baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
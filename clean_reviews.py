@@ -2,8 +2,46 @@ import json
 import re
 import os
 from pathlib import Path
-import emoji
+from functools import lru_cache
 import unicodedata
+from lang_detect import CACHE_MAX_LEN, detect_language, detect_script, group_by_script
+
+CLEAN_CACHE_SIZE = 4096  # Distinct short texts whose cleaned form is kept (see lang_detect.CACHE_MAX_LEN)
+
+SPECIAL_CHARS_RE = re.compile(r'[^\w\s]')
+# Indic vowel signs, viramas and nuktas are combining marks that \w does not match,
+# so the Indic blocks are kept whole apart from the danda punctuation marks (U+0964-U+0965)
+INDIC_SPECIAL_CHARS_RE = re.compile(r'[^\w\s\u0900-\u0963\u0966-\u0DFF]')
+WHITESPACE_RE = re.compile(r'\s+')
+
+def _clean_ascii(text):
+    """Fast path: ASCII text has no emojis and nothing for NFKD to decompose."""
+    text = SPECIAL_CHARS_RE.sub(' ', text)
+    return WHITESPACE_RE.sub(' ', text).strip().lower()
+
+def _clean_latin(text):
+    """Latin (and unrecognised) scripts: strip emojis and fold accents and styled letters with NFKD."""
+    import emoji  # Its data tables load on first use, not when the module is imported
+
+    text = emoji.replace_emoji(text, replace='')
+    text = unicodedata.normalize('NFKD', text)
+    return _clean_ascii(text)
+
+def _clean_indic(text):
+    """Indic scripts: strip emojis and compose with NFC so letters keep their combining marks."""
+    import emoji
+
+    text = emoji.replace_emoji(text, replace='')
+    text = unicodedata.normalize('NFC', text)
+    text = INDIC_SPECIAL_CHARS_RE.sub(' ', text)
+    return WHITESPACE_RE.sub(' ', text).strip().lower()
+
+# Cleaning path per routing script from lang_detect.detect_script; Indic scripts use _clean_indic
+CLEANERS = {
+    "ascii": _clean_ascii,
+    "Latn": _clean_latin,
+    "Other": _clean_latin,
+}
 
 def clean_text(text):
     """
@@ -13,28 +51,58 @@ def clean_text(text):
     3. Removing special characters
     4. Normalizing unicode characters
     5. Converting to lowercase
+
+    Each text is routed by script: plain ASCII skips the emoji and NFKD passes,
+    and Indic scripts are NFC-normalised so their combining marks survive.
+    Short texts, the only ones that repeat often, are cached.
     """
     if not isinstance(text, str):
         return ""
-    
-    # Convert to string if not already
-    text = str(text)
-    
-    # Remove emojis
-    text = emoji.replace_emoji(text, replace='')
-    
-    # Normalize unicode characters
-    text = unicodedata.normalize('NFKD', text)
-    
-    # Remove special characters and extra spaces
-    text = re.sub(r'[^\w\s]', ' ', text)  # Replace special chars with space
-    text = re.sub(r'\s+', ' ', text)      # Replace multiple spaces with single space
-    text = text.strip()                    # Remove leading/trailing spaces
-    
-    # Convert to lowercase
-    text = text.lower()
-    
-    return text
+    if len(text) <= CACHE_MAX_LEN:
+        return _clean_cached(text)
+    return _clean(text)
+
+@lru_cache(maxsize=CLEAN_CACHE_SIZE)
+def _clean_cached(text):
+    return _clean(text)
+
+def _clean(text):
+    return CLEANERS.get(detect_script(text), _clean_indic)(text)
+
+def clean_texts(texts):
+    """Clean a batch of texts as clean_text would, running each script's cleaning path over its group in turn."""
+    cleaned = [""] * len(texts)
+    for script, indices in group_by_script(texts).items():
+        cleaner = CLEANERS.get(script, _clean_indic)
+        for i in indices:
+            text = texts[i]
+            if isinstance(text, str):
+                cleaned[i] = _clean_cached(text) if len(text) <= CACHE_MAX_LEN else cleaner(text)
+    return cleaned
+
+def clean_review(review):
+    """Clean the text fields of a single review dict in place and tag its language."""
+    if 'content' in review:
+        review['lang'] = detect_language(review['content'])
+        review['content'] = clean_text(review['content'])
+    if 'title' in review:
+        review['title'] = clean_text(review['title'])
+    return review
+
+def clean_review_batch(reviews):
+    """Clean and language-tag a batch of review dicts in place; the batch form of clean_review."""
+    for field in ('content', 'title'):
+        batch = [review for review in reviews if field in review]
+        if field == 'content':
+            for review in batch:
+                review['lang'] = detect_language(review['content'])
+        for review, text in zip(batch, clean_texts([review[field] for review in batch])):
+            review[field] = text
+    return reviews
+
+def get_cleaned_file(file_path):
+    """Generates the cleaned output path for a saved reviews file."""
+    return Path('cleaned_reviews') / f"cleaned_{Path(file_path).name}"
 
 def process_reviews_file(file_path):
     """Process a single reviews file and clean the reviews."""
@@ -42,19 +110,15 @@ def process_reviews_file(file_path):
         with open(file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
         
-        # Clean each review
-        for review in data.get('reviews', []):
-            if 'content' in review:
-                review['content'] = clean_text(review['content'])
-            if 'title' in review:
-                review['title'] = clean_text(review['title'])
+        # Clean the reviews, grouped by script
+        clean_review_batch(data.get('reviews', []))
         
         # Create cleaned directory if it doesn't exist
         cleaned_dir = Path('cleaned_reviews')
         cleaned_dir.mkdir(exist_ok=True)
         
         # Save cleaned reviews
-        output_file = cleaned_dir / f"cleaned_{file_path.name}"
+        output_file = get_cleaned_file(file_path)
         with open(output_file, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=4)
         
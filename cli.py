@@ -0,0 +1,225 @@
+import os
+import re
+import sys
+import json
+import signal
+import argparse
+
+from review_filters import FILTER_FLAGS, add_filter_arguments, filter_overrides
+
+# Every command imports the modules it needs when it runs, so quick commands such
+# as stats and is-scraped never load selenium, google_play_scraper or emoji.
+
+SOURCES = ('playstore', 'quora', 'reddit')
+HEADER_BYTES = 4096  # Quora's totals are written before its discussions
+
+def select_apps(app_ids, names):
+    """Pick the APP_IDS entries named on the command line, by app name or package id."""
+    if not names:
+        return app_ids
+    selected = {}
+    for name in names:
+        matches = {k: v for k, v in app_ids.items() if name.lower() in (k.lower(), v.lower())}
+        if not matches:
+            print(f"Unknown app: {name}", file=sys.stderr)
+            raise SystemExit(2)  # Distinct from is-scraped's "not scraped" status
+        selected.update(matches)
+    return selected
+
+def read_saved_count(path, reader):
+    """Count reviews in a saved file, or None if it does not exist or cannot be read."""
+    if not os.path.exists(path):
+        return None
+    try:
+        return reader(path)
+    except Exception:
+        return None
+
+def count_lines(path):
+    with open(path, 'rb') as f:
+        return sum(1 for _ in f)
+
+def read_header_total(path, key):
+    """Read a total written near the top of a JSON file without loading the rest."""
+    with open(path, 'rb') as f:
+        head = f.read(HEADER_BYTES).decode('utf-8', errors='ignore')
+    match = re.search(rf'"{key}":\s*(\d+)', head)
+    return int(match.group(1)) if match else None
+
+# ---------------------------------------------------------------------------
+# Commands
+# ---------------------------------------------------------------------------
+
+def cmd_scrape(args):
+    if args.source == 'playstore':
+        import play_store
+
+        signal.signal(signal.SIGINT, play_store.signal_handler)
+        signal.signal(signal.SIGTERM, play_store.signal_handler)
+        apps = select_apps(play_store.APP_IDS, args.app)
+        overrides = filter_overrides(args)
+        review_filter = play_store.build_review_filter(overrides) if overrides else None
+        if args.stream:
+            import pipeline
+
+            for app_name, app_id in apps.items():
+                if not play_store.should_continue:
+                    break
+                pipeline.stream_app_reviews(app_name, app_id, review_filter=review_filter)
+        else:
+            play_store.scrape_apps(apps, fanout=args.fanout, review_filter=review_filter)
+    elif args.source == 'reddit':
+        import reddit
+
+        reddit.main()
+    elif args.source == 'quora':
+        import quora_scraper
+
+        signal.signal(signal.SIGINT, quora_scraper.signal_handler)
+        signal.signal(signal.SIGTERM, quora_scraper.signal_handler)
+        quora_scraper.scrape_quora_discussions()
+    print("\nScraping complete!")
+
+def cmd_clean(args):
+    import clean_reviews
+
+    if not args.app:
+        clean_reviews.main()
+        return
+    import play_store
+    from pathlib import Path
+
+    for app_name in select_apps(play_store.APP_IDS, args.app):
+        output_file = Path(play_store.get_output_file(app_name))
+        if output_file.exists():
+            clean_reviews.process_reviews_file(output_file)
+        else:
+            print(f"No saved reviews for {app_name}")
+
+def cmd_export(args):
+    import work_queue
+
+    queue = work_queue.open_queue(args.db or work_queue.QUEUE_DB)
+    for kind in args.kinds or SOURCES:
+        work_queue.EXPORTERS[kind](queue)
+
+def collect_stats():
+    """Review and discussion counts read from the files on disk."""
+    import play_store
+    import pipeline
+    import reddit
+    import quora_scraper
+    from clean_reviews import get_cleaned_file
+
+    apps = {}
+    for app_name in play_store.APP_IDS:
+        raw_file = play_store.get_output_file(app_name)
+        cleaned_file = get_cleaned_file(raw_file)
+        apps[app_name] = {
+            "raw": read_saved_count(raw_file, play_store.count_saved_reviews),
+            "cleaned": read_saved_count(cleaned_file, play_store.count_saved_reviews),
+            "streamed": read_saved_count(pipeline.get_stream_file(app_name), count_lines),
+        }
+    reddit_files = []
+    if os.path.isdir(reddit.OUTPUT_DIR):
+        reddit_files = [name for name in os.listdir(reddit.OUTPUT_DIR) if name.endswith('.json')]
+    return {
+        "target_review_count": play_store.TARGET_REVIEW_COUNT,
+        "playstore": apps,
+        "reddit_files": len(reddit_files),
+        "quora_questions": read_saved_count(
+            quora_scraper.OUTPUT_FILE, lambda path: read_header_total(path, "total_questions")),
+    }
+
+def cmd_stats(args):
+    stats = collect_stats()
+    if args.json:
+        print(json.dumps(stats, indent=4))
+        return
+    width = max(len(name) for name in stats["playstore"])
+    print(f"{'App':<{width}}  {'Raw':>6}  {'Cleaned':>7}  {'Streamed':>8}")
+    for app_name, counts in stats["playstore"].items():
+        cells = ["-" if counts[k] is None else str(counts[k]) for k in ("raw", "cleaned", "streamed")]
+        print(f"{app_name:<{width}}  {cells[0]:>6}  {cells[1]:>7}  {cells[2]:>8}")
+    print(f"\nTarget reviews per app: {stats['target_review_count']}")
+    print(f"Reddit conversation files: {stats['reddit_files']}")
+    quora = stats["quora_questions"]
+    print(f"Quora questions: {'-' if quora is None else quora}")
+
+def cmd_is_scraped(args):
+    """Exit 0 if the app's saved reviews reach TARGET_REVIEW_COUNT, 1 otherwise."""
+    import play_store
+
+    app_name = next(iter(select_apps(play_store.APP_IDS, [args.app])))
+    count = read_saved_count(play_store.get_output_file(app_name), play_store.count_saved_reviews) or 0
+    scraped = count >= play_store.TARGET_REVIEW_COUNT
+    if not args.quiet:
+        print(f"{app_name}: {count}/{play_store.TARGET_REVIEW_COUNT} reviews"
+              f" ({'scraped' if scraped else 'not scraped'})")
+    return 0 if scraped else 1
+
+COMMANDS = {
+    "scrape": cmd_scrape,
+    "clean": cmd_clean,
+    "export": cmd_export,
+    "stats": cmd_stats,
+    "is-scraped": cmd_is_scraped,
+}
+
+def source_kind(value):
+    """argparse type for export sources; `choices` would also reject an empty nargs='*' list."""
+    if value not in SOURCES:
+        raise argparse.ArgumentTypeError(f"invalid source {value!r} (choose from {', '.join(SOURCES)})")
+    return value
+
+def check_scrape_args(parser, args):
+    """Reject flags that the chosen source or mode would otherwise silently ignore."""
+    if args.source != 'playstore':
+        flags = [flag for flag, given in (('--app', args.app), ('--fanout', args.fanout), ('--stream', args.stream))
+                 if given]
+        flags += [FILTER_FLAGS[key] for key in filter_overrides(args)]
+        if flags:
+            parser.error(f"{', '.join(flags)} only apply to playstore, not {args.source}")
+    elif args.stream and args.fanout:
+        parser.error("--stream scrapes one listing per app and cannot be combined with --fanout")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run any stage of the review and discussion scrapers.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    scrape = subparsers.add_parser('scrape', help="Scrape one source")
+    scrape.add_argument('source', choices=SOURCES)
+    scrape.add_argument('--app', action='append', help="Play Store app name or id (repeatable; default: all)")
+    scrape.add_argument('--fanout', action='store_true', help="Scrape every Play Store locale/sort listing")
+    scrape.add_argument('--stream', action='store_true', help="Scrape and clean Play Store reviews in one pass")
+    add_filter_arguments(scrape)
+
+    clean = subparsers.add_parser('clean', help="Clean saved Play Store reviews")
+    clean.add_argument('--app', action='append', help="App name or id (repeatable; default: all)")
+
+    export = subparsers.add_parser('export', help="Write crawl queue results to the usual output files")
+    export.add_argument('kinds', nargs='*', type=source_kind, help="Sources to export (default: all)")
+    export.add_argument('--db', help="Queue database file or `serve` URL (default: work_queue.QUEUE_DB)")
+
+    stats = subparsers.add_parser('stats', help="Show saved review and discussion counts")
+    stats.add_argument('--json', action='store_true', help="Print the counts as JSON")
+
+    is_scraped = subparsers.add_parser('is-scraped', help="Exit 0 if an app has reached the review target")
+    is_scraped.add_argument('app', help="App name or id")
+    is_scraped.add_argument('-q', '--quiet', action='store_true')
+
+    args = parser.parse_args(argv)
+    if args.command == 'scrape':
+        check_scrape_args(scrape, args)
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        return COMMANDS[args.command](args) or 0
+    except KeyboardInterrupt:
+        print("\nInterrupted. Exiting gracefully...")
+        return 130
+
+if __name__ == "__main__":
+    sys.exit(main())
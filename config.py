@@ -0,0 +1,19 @@
+import json
+import os
+from functools import lru_cache
+
+# Shared settings for every scraper; SCRAPER_CONFIG points at an alternative file
+CONFIG_FILE = os.environ.get(
+    "SCRAPER_CONFIG",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json"),
+)
+
+@lru_cache(maxsize=None)
+def load_config(path=None):
+    """Load the shared config file once per process."""
+    with open(path or CONFIG_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def get_section(name):
+    """Return one source's settings, e.g. get_section('reddit')."""
+    return load_config().get(name, {})
@@ -0,0 +1,138 @@
+import re
+from functools import lru_cache
+
+# Configuration
+# Only short texts ("good app", "worst") repeat across reviews often enough to be worth
+# caching; longer ones are almost all unique and would only hold memory
+CACHE_MAX_LEN = 32
+CACHE_SIZE = 4096  # Distinct short texts whose classification is kept
+WORD_CACHE_SIZE = 50000  # Words whose trigram score is kept; vocabulary repeats where texts do not
+
+# Script of each 128-code-point Unicode block we route on (code point >> 7).
+# The Indic blocks are all 128 wide and aligned, so one lookup per character suffices.
+BLOCK_SCRIPTS = {
+    0x0900 >> 7: "Deva",  # Devanagari: Hindi, Marathi, Nepali
+    0x0980 >> 7: "Beng",  # Bengali, Assamese
+    0x0A00 >> 7: "Guru",  # Gurmukhi: Punjabi
+    0x0A80 >> 7: "Gujr",
+    0x0B00 >> 7: "Orya",
+    0x0B80 >> 7: "Taml",
+    0x0C00 >> 7: "Telu",
+    0x0C80 >> 7: "Knda",
+    0x0D00 >> 7: "Mlym",
+}
+
+# Language reported for text dominated by an Indic script
+SCRIPT_LANGS = {
+    "Deva": "hi",
+    "Beng": "bn",
+    "Guru": "pa",
+    "Gujr": "gu",
+    "Orya": "or",
+    "Taml": "ta",
+    "Telu": "te",
+    "Knda": "kn",
+    "Mlym": "ml",
+}
+
+# Character trigram weights (over " word " padded tokens) for telling romanised
+# Hindi apart from English. Positive favours Hinglish, negative English.
+TRIGRAM_WEIGHTS = {
+    # Hinglish
+    " ha": 0.3, "hai": 2.0, "ai ": 0.8, "nah": 2.0, "ahi": 2.0, "hi ": 0.4, " ky": 2.0, "kya": 2.0,
+    "bhi": 2.0, " bh": 1.2, "aha": 0.8, "aa ": 1.0, "bah": 1.5, "hut": 1.0, "kar": 1.2, "rna": 1.2,
+    "aya": 1.2, "iya": 1.2, "ega": 1.5, "ogi": 1.5, "oge": 1.5, "ata": 0.6, "rah": 1.0, " ka": 0.6,
+    " ki": 0.4, " ko": 0.8, " se": 0.4, " ye": 1.0, "yeh": 2.0, "mer": 0.8, "pai": 1.2,
+    "ais": 1.0, "isa": 0.8, "kaa": 1.5, "kiy": 2.0, "diy": 2.0, "liy": 2.0, "gay": 1.5, "aap": 1.5,
+    " jh": 1.5, "chh": 1.5, "cch": 1.5, "bak": 1.0, "kwa": 1.5, "bek": 1.5, "kuc": 2.0, "uch": 0.8,
+    " pe": 0.3, "dhi": 1.2, "thi": 0.6, "tha": 0.6, "gha": 1.2,
+    # English
+    "the": -2.0, "he ": -1.0, " th": -1.5, "ing": -2.0, "ng ": -1.2, "and": -1.5, " an": -0.6,
+    "ion": -1.5, "tio": -1.5, "ent": -1.0, "for": -1.2, "or ": -0.6, "is ": -0.6, " is": -0.6,
+    "ed ": -1.2, "er ": -0.8, "ver": -0.8, "ery": -1.0, "ly ": -1.2, "oul": -1.5, "wit": -1.2,
+    "ith": -1.2, "you": -1.2, "ou ": -0.8, "not": -0.8, "ot ": -0.4, "pp ": -0.4, "eve": -0.8,
+    "ble": -1.2, "rea": -0.8, "ear": -0.8, "all": -0.6, "ter": -0.8, "st ": -0.6, "rst": -0.6,
+}
+
+HINGLISH_THRESHOLD = 0.25  # Mean trigram score per word above which Latin text is Hinglish
+TOKEN_RE = re.compile(r"[a-z]+")
+
+def script_counts(text):
+    """Count characters per routing script: 'ascii', 'Latn' (non-ASCII letters) or an Indic script."""
+    counts = {}
+    for char in text:
+        code = ord(char)
+        if code < 128:
+            if char.isalpha():
+                counts["ascii"] = counts.get("ascii", 0) + 1
+            continue
+        script = BLOCK_SCRIPTS.get(code >> 7)
+        if script is None:
+            if not char.isalpha():
+                continue  # Emoji, punctuation, symbols
+            script = "Latn" if code < 0x0250 else "Other"
+        counts[script] = counts.get(script, 0) + 1
+    return counts
+
+def hinglish_score(text):
+    """Mean trigram weight per word; positive means romanised Hindi is more likely."""
+    words = TOKEN_RE.findall(text.lower())
+    if not words:
+        return 0.0
+    return sum(map(_word_score, words)) / len(words)
+
+@lru_cache(maxsize=WORD_CACHE_SIZE)
+def _word_score(word):
+    padded = f" {word} "
+    return sum(TRIGRAM_WEIGHTS.get(padded[i:i + 3], 0.0) for i in range(len(padded) - 2))
+
+def analyze(text):
+    """Return (script, lang) for a text.
+
+    script is the cleaning route: 'ascii', 'Latn', 'Other' or an Indic script
+    code such as 'Deva'. lang is 'en', 'hi-Latn' (Hinglish), an Indic language
+    code, or 'und' when there are no letters to go on. Short texts are cached.
+    """
+    if len(text) <= CACHE_MAX_LEN:
+        return _analyze_cached(text)
+    return _analyze(text)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _analyze_cached(text):
+    return _analyze(text)
+
+def _analyze(text):
+    script = detect_script(text)
+    if script in SCRIPT_LANGS:
+        return script, SCRIPT_LANGS[script]
+    if script == "Other" or not TOKEN_RE.search(text.lower()):
+        return script, "und"
+    return script, "hi-Latn" if hinglish_score(text) > HINGLISH_THRESHOLD else "en"
+
+def detect_script(text):
+    """Cleaning route for a text: 'ascii', 'Latn', 'Other' or the dominant Indic script."""
+    if text.isascii():
+        return "ascii"
+    counts = script_counts(text)
+    indic = {s: n for s, n in counts.items() if s in SCRIPT_LANGS}
+    latin = counts.get("ascii", 0) + counts.get("Latn", 0)
+    if indic and max(indic.values()) >= latin:
+        return max(indic, key=indic.get)
+    return "Latn" if latin else "Other"
+
+def group_by_script(texts):
+    """Map each cleaning route to the indices of the texts that take it, for batch processing.
+
+    Empty and non-string texts are grouped under 'ascii'.
+    """
+    groups = {}
+    for i, text in enumerate(texts):
+        script = detect_script(text) if isinstance(text, str) and text else "ascii"
+        groups.setdefault(script, []).append(i)
+    return groups
+
+def detect_language(text):
+    """Language tag for a text; see analyze()."""
+    if not isinstance(text, str) or not text:
+        return "und"
+    return analyze(text)[1]
@@ -0,0 +1,202 @@
+import json
+import os
+import queue
+import signal
+import threading
+
+import play_store
+from clean_reviews import clean_review_batch
+
+# Configuration
+OUTPUT_DIR = "cleaned_reviews"
+QUEUE_SIZE = 4  # Batches buffered between stages before the upstream stage blocks
+PUT_TIMEOUT = 0.5  # How often a blocked stage re-checks for shutdown
+
+# Marks the end of a stage's output
+_DONE = object()
+
+def get_stream_file(app_name_key):
+    """Generates the streaming store filename for a given app."""
+    return os.path.join(OUTPUT_DIR, f"cleaned_reviews_{app_name_key.replace(' ', '_').lower()}.jsonl")
+
+def stream_app_names():
+    """Map streaming store file names back to their APP_IDS names, e.g. IRCTC rather than Irctc."""
+    return {os.path.basename(get_stream_file(app_name)): app_name for app_name in play_store.APP_IDS}
+
+def load_seen_review_ids(stream_file):
+    """Read the review ids already in a stream file so an interrupted run can resume."""
+    seen = set()
+    if not os.path.exists(stream_file):
+        return seen
+    with open(stream_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                seen.add(json.loads(line)['review_id'])
+            except (ValueError, KeyError):
+                # A partially written last line from an earlier crash
+                continue
+    return seen
+
+class StreamingPipeline:
+    """Fetch, format+clean and store reviews for one app as concurrent, bounded stages.
+
+    Each stage runs in its own thread and hands batches to the next through a
+    bounded queue, so network waits in the fetch stage overlap with cleaning and
+    a slow downstream stage blocks the fetcher instead of growing memory. Cleaned
+    reviews are appended to a JSON Lines store and flushed after every batch.
+    """
+
+    def __init__(self, app_name, app_id, target=None, queue_size=QUEUE_SIZE, review_filter=None):
+        self.app_name = app_name
+        self.app_id = app_id
+        self.target = target or play_store.TARGET_REVIEW_COUNT
+        self.review_filter = play_store.resolve_review_filter(review_filter)
+        self.output_file = get_stream_file(app_name)
+        self.seen = load_seen_review_ids(self.output_file)
+        self.raw_batches = queue.Queue(maxsize=queue_size)
+        self.clean_batches = queue.Queue(maxsize=queue_size)
+        self.stop = threading.Event()
+        # Set once a queue's consumer has exited, so producers stop waiting for room in it
+        self.closed = {q: threading.Event() for q in (self.raw_batches, self.clean_batches)}
+        self.errors = []
+        self.written = 0
+
+    def _put(self, q, item):
+        """Put with backpressure, giving up if the pipeline is shutting down."""
+        while not self.stop.is_set() and not self.closed[q].is_set():
+            try:
+                q.put(item, timeout=PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _finish(self, q):
+        # The sentinel must get through even after a stop so downstream stages exit,
+        # unless the downstream stage has already exited and will never read it
+        while not self.closed[q].is_set():
+            try:
+                q.put(_DONE, timeout=PUT_TIMEOUT)
+                return
+            except queue.Full:
+                continue
+
+    def _run_stage(self, stage, source, output):
+        try:
+            stage()
+        except Exception as e:
+            print(f"Pipeline stage {stage.__name__} failed for {self.app_name}: {str(e)}")
+            self.errors.append(e)
+            self.stop.set()
+        finally:
+            if source is not None:
+                self.closed[source].set()
+            if output is not None:
+                self._finish(output)
+
+    def fetch(self):
+        """Stage 1: page through the Play Store and hand raw batches downstream."""
+        for result in play_store.iter_review_batches(self.app_name, self.app_id,
+                                                      review_filter=self.review_filter):
+            if self.stop.is_set() or not self._put(self.raw_batches, result):
+                break
+
+    def clean(self):
+        """Stage 2: format, de-duplicate and clean each batch."""
+        accepted = len(self.seen)
+        no_new_reviews_count = 0
+        while True:
+            result = self.raw_batches.get()
+            if result is _DONE:
+                break
+            if self.stop.is_set():
+                continue  # Drain so the fetcher is never left blocked
+
+            cleaned = []
+            for review in result:
+                if accepted >= self.target:
+                    break
+                formatted_review = play_store.format_review(review, self.review_filter)
+                if not formatted_review or formatted_review['review_id'] in self.seen:
+                    continue
+                self.seen.add(formatted_review['review_id'])
+                cleaned.append(formatted_review)
+                accepted += 1
+
+            if cleaned:
+                clean_review_batch(cleaned)
+                no_new_reviews_count = 0
+                self._put(self.clean_batches, cleaned)
+            else:
+                no_new_reviews_count += 1
+            if accepted >= self.target or not play_store.should_continue or no_new_reviews_count >= 3:
+                self.stop.set()
+
+    def write(self):
+        """Stage 3: append cleaned reviews to the JSON Lines store as they arrive."""
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        with open(self.output_file, 'a', encoding='utf-8') as f:
+            while True:
+                batch = self.clean_batches.get()
+                if batch is _DONE:
+                    break
+                for review in batch:
+                    f.write(json.dumps(review, ensure_ascii=False))
+                    f.write('\n')
+                f.flush()
+                self.written += len(batch)
+                print(f"Stored {self.written} cleaned reviews for {self.app_name}")
+
+    def run(self):
+        """Run all stages to completion and return the number of reviews written.
+
+        If any stage failed, the first error is re-raised once every stage has
+        stopped; reviews already written stay in the store for the next run.
+        """
+        if len(self.seen) >= self.target:
+            print(f"\nSkipping {self.app_name} - already streamed {len(self.seen)} reviews")
+            return 0
+
+        print(f"\n--- Streaming reviews for {self.app_name} (ID: {self.app_id}) into {self.output_file} ---")
+        stages = [
+            threading.Thread(target=self._run_stage, args=(self.fetch, None, self.raw_batches), daemon=True),
+            threading.Thread(target=self._run_stage, args=(self.clean, self.raw_batches, self.clean_batches),
+                             daemon=True),
+            threading.Thread(target=self._run_stage, args=(self.write, self.clean_batches, None), daemon=True),
+        ]
+        for stage in stages:
+            stage.start()
+        for stage in stages:
+            stage.join()
+
+        if self.errors:
+            print(f"--- Streaming {self.app_name} failed after {self.written} new reviews ---")
+            raise self.errors[0]
+        print(f"--- Finished streaming {self.app_name}. New reviews: {self.written} ---")
+        return self.written
+
+def stream_app_reviews(app_name, app_id, target=None, review_filter=None):
+    """Scrape and clean an app's reviews in one streaming pass."""
+    exists, actual_app_name = play_store.verify_app_exists(app_id)
+    if not exists:
+        print(f"App {app_name} (ID: {app_id}) not found in Google Play Store. Skipping...")
+        return 0
+    return StreamingPipeline(app_name, app_id, target=target, review_filter=review_filter).run()
+
+if __name__ == "__main__":
+    # Set up signal handlers
+    signal.signal(signal.SIGINT, play_store.signal_handler)
+    signal.signal(signal.SIGTERM, play_store.signal_handler)
+
+    try:
+        for app_name, app_id in play_store.APP_IDS.items():
+            if not play_store.should_continue:
+                break
+            stream_app_reviews(app_name, app_id)
+        print("\nAll streaming complete!")
+    except KeyboardInterrupt:
+        print("\nScript interrupted by user. Exiting gracefully...")
+    except Exception as e:
+        print(f"\nUnexpected error: {str(e)}")
+    finally:
+        print("\nScript execution finished.")
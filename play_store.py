@@ -1,39 +1,42 @@
 import json
+import re
 import time
 import os
 import signal
-from google_play_scraper import Sort, reviews, app
+import uuid
+import textwrap
+import threading
+import config
+from review_filters import ReviewFilter
 import random
 from datetime import datetime, date
 import sys
 
 # Configuration
-APP_IDS = {
-    "Amazon Shopping": "com.amazon.mShop.android.shopping",
-    "Flipkart Online Shopping": "com.flipkart.android",
-    "Tata Neu": "com.tatadigital.tcp",
-    "BookMyShow": "com.bt.bms",
-    "RedBus": "in.redbus.android",
-    "IRCTC": "cris.org.in.prs.ima",
-    "ConfirmTkt": "com.confirmtkt.lite",
-    "JioMart": "com.jiomart",
-    "Zepto": "com.zepto.app",
-    "Blinkit": "com.grofers.customerapp",
-    "MakeMyTrip": "com.makemytrip",
-    "Rapido": "com.rapido.passenger",
-    "Swiggy": "in.swiggy.android",
-    "Zomato": "com.application.zomato",
-    "Ekart": "com.ekart.firstmile",
-    "Shiprocket": "com.shiprocket.shiprocket",
-    "Delhivery": "com.delhiveryConsigneeApp"
-}
+# App list, date range, target and fan-out listings are shared in config.json
+PLAYSTORE_CONFIG = config.get_section("playstore")
+APP_IDS = PLAYSTORE_CONFIG["app_ids"]
 
 OUTPUT_DIR = "playstore_reviews"
-TARGET_REVIEW_COUNT = 1000  # Target 1000 reviews per app
+TARGET_REVIEW_COUNT = PLAYSTORE_CONFIG["target_review_count"]  # Reviews per app
 MAX_RETRIES = 3
 RETRY_DELAY = 10  # Reduced delay between retries
 REQUEST_DELAY = 1  # Delay between requests
-START_DATE = date(2025, 1, 1)  # January 1st, 2025
+START_DATE = date.fromisoformat(PLAYSTORE_CONFIG["start_date"])
+# Extra ReviewFilter criteria for every scrape, e.g. {"scores": [1, 2]}; see ReviewFilter.from_dict
+REVIEW_FILTER = PLAYSTORE_CONFIG.get("review_filter", {})
+FLUSH_BATCH_SIZE = 500  # Reviews held in memory before they are appended to the output file
+
+# Default Play Store listing to scrape: (lang, country, sort)
+DEFAULT_SOURCE = ("en", "in", "MOST_RELEVANT")
+
+# Fan-out mode scrapes every combination below in parallel and merges the results.
+# Sort values are google_play_scraper.Sort member names.
+FANOUT_LOCALES = [tuple(locale) for locale in PLAYSTORE_CONFIG["fanout_locales"]]
+FANOUT_SORTS = PLAYSTORE_CONFIG["fanout_sorts"]
+# Listings fetched concurrently per app: one thread per listing, so a fan-out run takes
+# about as long as its slowest listing, up to this many threads
+FANOUT_MAX_WORKERS = PLAYSTORE_CONFIG["fanout_max_workers"]
 
 # Global flag for graceful shutdown
 should_continue = True
@@ -52,31 +55,88 @@ def get_output_file(app_name_key):
     """Generates the output filename for a given app."""
     return os.path.join(OUTPUT_DIR, f"reviews_{app_name_key.replace(' ', '_').lower()}.json")
 
+class ReviewFileWriter:
+    """Write an app's review file incrementally, one batch at a time.
+
+    The output is byte-for-byte the layout json.dump(..., indent=4) produced for
+    the whole document, so readers of playstore_reviews are unaffected. Data goes
+    to a ".partial" file that only replaces the real one on close, so an
+    interrupted run never leaves a truncated review file behind.
+    """
+
+    def __init__(self, app_name_key, review_filter=None):
+        self.app_name_key = app_name_key
+        self.review_filter = resolve_review_filter(review_filter)
+        self.output_file = get_output_file(app_name_key)
+        self.partial_file = self.output_file + ".partial"
+        self.count = 0
+        self._file = None
+
+    def _open(self):
+        app_id = APP_IDS[self.app_name_key]
+        header = {
+            "app_name": self.app_name_key,
+            "app_id": app_id,
+            "play_store_url": f"https://play.google.com/store/apps/details?id={app_id}&hl=en_IN",
+        }
+        self._file = open(self.partial_file, 'w', encoding='utf-8')
+        self._file.write("{\n")
+        for key, value in header.items():
+            self._file.write(f"    {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n")
+        self._file.write('    "reviews": [')
+
+    def write(self, reviews):
+        """Append formatted review dicts to the file."""
+        if self._file is None:
+            self._open()
+        for review in reviews:
+            separator = ",\n" if self.count else "\n"
+            body = json.dumps(review, ensure_ascii=False, indent=4)
+            self._file.write(separator + textwrap.indent(body, " " * 8))
+            self.count += 1
+        self._file.flush()
+
+    def close(self):
+        """Write the trailing totals and move the finished file into place."""
+        if self._file is None:
+            self._open()
+        footer = {
+            "total_reviews": self.count,
+            "last_updated": datetime.now().isoformat(),
+            "date_range": {
+                "start": self.review_filter.start_date.isoformat(),
+                "end": (self.review_filter.end_date or datetime.now().date()).isoformat()
+            }
+        }
+        body = json.dumps(footer, ensure_ascii=False, indent=4)
+        self._file.write("\n    ],\n" if self.count else "],\n")
+        self._file.write(body[2:])  # Drop the opening brace; the fields continue the document
+        self._file.close()
+        self._file = None
+        os.replace(self.partial_file, self.output_file)
+
+    def discard(self):
+        """Abandon the file without touching any previously saved output."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            os.remove(self.partial_file)
+
 def save_reviews_to_json(app_name_key, all_reviews):
     """Save all scraped reviews for an app to its final JSON file."""
-    output_file = get_output_file(app_name_key)
-    data = {
-        "app_name": app_name_key,
-        "app_id": APP_IDS[app_name_key],
-        "play_store_url": f"https://play.google.com/store/apps/details?id={APP_IDS[app_name_key]}&hl=en_IN",
-        "reviews": all_reviews,
-        "total_reviews": len(all_reviews),
-        "last_updated": datetime.now().isoformat(),
-        "date_range": {
-            "start": START_DATE.isoformat(),
-            "end": datetime.now().date().isoformat()
-        }
-    }
-    
+    writer = ReviewFileWriter(app_name_key)
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
-        print(f"Saved {len(all_reviews)} reviews to {output_file}")
+        writer.write(all_reviews)
+        writer.close()
+        print(f"Saved {writer.count} reviews to {writer.output_file}")
     except Exception as e:
         print(f"Error saving reviews to file: {str(e)}")
+        writer.discard()
 
 def verify_app_exists(app_id):
     """Verify if the app exists in Google Play Store."""
+    from google_play_scraper import app
+
     try:
         app_info = app(app_id)
         return True, app_info.get('title', 'Unknown App')
@@ -84,99 +144,148 @@ def verify_app_exists(app_id):
         print(f"Error verifying app {app_id}: {str(e)}")
         return False, None
 
-def format_review(review):
-    """Format a review with proper date handling and content structure."""
+class CompactReview:
+    """Slotted in-flight representation of a formatted review.
+
+    Holds only the fields format_review emits, without a per-review dict, and
+    expands to the full dict when it is written out.
+    """
+
+    __slots__ = ('review_id', 'score', 'author_name', 'at', 'content', 'reply_content',
+                 'thumbs_up_count', 'review_created_version', 'source')
+
+    def __init__(self, review_id, score, author_name, at, content, reply_content,
+                 thumbs_up_count, review_created_version, source=None):
+        self.review_id = review_id
+        self.score = score
+        self.author_name = author_name
+        self.at = at
+        self.content = content
+        self.reply_content = reply_content
+        self.thumbs_up_count = thumbs_up_count
+        self.review_created_version = review_created_version
+        self.source = source
+
+    @property
+    def date(self):
+        return self.at.strftime('%Y-%m-%d %H:%M:%S')
+
+    def to_dict(self):
+        formatted = {
+            'review_id': self.review_id,
+            'score': self.score,
+            'author_name': self.author_name,
+            'date': self.date,
+            'rating': self.score,
+            'content': self.content,
+            'reply_content': self.reply_content,
+            'thumbs_up_count': self.thumbs_up_count,
+            'review_created_version': self.review_created_version,
+            'at': self.at.isoformat()
+        }
+        if self.source is not None:
+            # Provenance: the listing (lang, country, sort) the review was first seen in
+            formatted['source'] = dict(zip(('lang', 'country', 'sort'), self.source))
+        return formatted
+
+_default_filter = None
+_default_filter_key = None
+
+def build_review_filter(overrides=None):
+    """ReviewFilter from START_DATE and REVIEW_FILTER in the config, with overrides (e.g. CLI flags) on top."""
+    return ReviewFilter.from_dict({"start_date": START_DATE, **REVIEW_FILTER, **(overrides or {})})
+
+def default_review_filter():
+    """The filter every scrape applies unless given another: the configured one."""
+    global _default_filter, _default_filter_key
+    # Rebuilt only if START_DATE or REVIEW_FILTER has been changed since the last call
+    key = (START_DATE, json.dumps(REVIEW_FILTER, sort_keys=True, default=str))
+    if _default_filter is None or _default_filter_key != key:
+        _default_filter = build_review_filter()
+        _default_filter_key = key
+    return _default_filter
+
+def resolve_review_filter(review_filter=None):
+    """The filter to apply: the default if none is given, and never without a start date.
+
+    A filter that leaves start_date unset still gets the START_DATE floor, so
+    narrowing a crawl by score or version does not widen it to every year.
+    """
+    if review_filter is None:
+        return default_review_filter()
+    if review_filter.start_date is None:
+        return review_filter.replace(start_date=START_DATE)
+    return review_filter
+
+def compact_review(review):
+    """Convert a raw review into a CompactReview, or None if it has no valid date.
+
+    Filtering is not done here; iter_review_batches has already applied it.
+    """
     try:
         review_date = review.get('at')
         if not isinstance(review_date, datetime):
             return None
 
-        # Skip reviews before START_DATE
-        if review_date.date() < START_DATE:
-            return None
-
-        return {
-            'review_id': review.get('reviewId'),
-            'score': review.get('score'),
-            'author_name': review.get('userName'),
-            'date': review_date.strftime('%Y-%m-%d %H:%M:%S'),
-            'rating': review.get('score'),
-            'content': review.get('content', ''),
-            'reply_content': review.get('replyContent', ''),
-            'thumbs_up_count': review.get('thumbsUpCount', 0),
-            'review_created_version': review.get('reviewCreatedVersion', ''),
-            'at': review_date.isoformat()
-        }
+        return CompactReview(
+            review.get('reviewId'),
+            review.get('score'),
+            review.get('userName'),
+            review_date,
+            review.get('content', ''),
+            review.get('replyContent', ''),
+            review.get('thumbsUpCount', 0),
+            review.get('reviewCreatedVersion', '')
+        )
     except Exception as e:
         print(f"Error formatting review: {str(e)}")
         return None
 
-def scrape_app_reviews(app_name, app_id):
-    """Scrapes user reviews for a given app from Google Play Store."""
+def format_review(review, review_filter=None):
+    """Format a review with proper date handling and content structure."""
+    review_filter = resolve_review_filter(review_filter)
+    if not review_filter.matches(review):
+        return None
+    compact = compact_review(review)
+    return compact.to_dict() if compact else None
+
+def review_dedup_key(review_id):
+    """Compact de-duplication key: the 16 raw bytes of UUID review ids, else the id itself."""
+    try:
+        return uuid.UUID(review_id).bytes
+    except (TypeError, ValueError, AttributeError):
+        return review_id
+
+def iter_review_batches(app_name, app_id, lang='en', country='in', sort='MOST_RELEVANT',
+                        review_filter=None):
+    """Yield raw review batches for an app, handling pagination, retries and request delays.
+
+    Only reviews matching review_filter (see resolve_review_filter) are yielded.
+    A single allowed score is pushed down to the Play Store request, and paging
+    stops as soon as the sort order guarantees no later page can match.
+    """
     global should_continue
-    
-    print(f"\n--- Starting scraping for {app_name} (ID: {app_id}) ---")
-    print(f"Play Store URL: https://play.google.com/store/apps/details?id={app_id}&hl=en_IN")
-    print(f"Scraping reviews from {START_DATE} to present (Target: {TARGET_REVIEW_COUNT} reviews)")
-    
-    # Verify app exists first
-    exists, actual_app_name = verify_app_exists(app_id)
-    if not exists:
-        print(f"App {app_name} (ID: {app_id}) not found in Google Play Store. Skipping...")
-        return
-    
-    if actual_app_name != app_name:
-        print(f"Note: App name in Play Store is '{actual_app_name}', different from provided name '{app_name}'")
-    
-    all_reviews = []
-    current_reviews_count = 0
+    # Imported here so commands that only read saved files skip loading the scraper
+    from google_play_scraper import Sort, reviews
+
+    review_filter = resolve_review_filter(review_filter)
+
     retry_count = 0
     continuation_token = None
-    no_new_reviews_count = 0
+    empty_batches = 0
 
-    while should_continue and retry_count < MAX_RETRIES and current_reviews_count < TARGET_REVIEW_COUNT:
+    while should_continue and retry_count < MAX_RETRIES:
         try:
             # Fetch reviews in batches with proper error handling
             result, new_continuation_token = reviews(
                 app_id,
-                lang='en',
-                country='in',
-                sort=Sort.MOST_RELEVANT,
+                lang=lang,
+                country=country,
+                sort=getattr(Sort, sort),
                 count=100,
+                filter_score_with=review_filter.server_score,
                 continuation_token=continuation_token
             )
-            
-            if not result:
-                no_new_reviews_count += 1
-                if no_new_reviews_count >= 3:
-                    print(f"No more new reviews found for {app_name}. Ending scraping for this app.")
-                    break
-                time.sleep(REQUEST_DELAY)
-                continue
-
-            no_new_reviews_count = 0
-            new_reviews_added = False
-
-            for review in result:
-                if not should_continue or current_reviews_count >= TARGET_REVIEW_COUNT:
-                    break
-                    
-                formatted_review = format_review(review)
-                if formatted_review and not any(r['review_id'] == formatted_review['review_id'] for r in all_reviews):
-                    all_reviews.append(formatted_review)
-                    current_reviews_count += 1
-                    new_reviews_added = True
-                    print(f"Scraped review {current_reviews_count}/{TARGET_REVIEW_COUNT} (Date: {formatted_review['date']})")
-
-            if not new_reviews_added:
-                no_new_reviews_count += 1
-                if no_new_reviews_count >= 3:
-                    print(f"No more new reviews found for {app_name}. Ending scraping for this app.")
-                    break
-
-            continuation_token = new_continuation_token
-            time.sleep(REQUEST_DELAY)
-
         except KeyboardInterrupt:
             print("\nReceived keyboard interrupt. Saving progress...")
             should_continue = False
@@ -189,42 +298,233 @@ def scrape_app_reviews(app_name, app_id):
                 time.sleep(RETRY_DELAY)
             else:
                 print(f"Max retries reached for {app_name}. Saving current progress.")
+            continue
+
+        if not result:
+            empty_batches += 1
+            if empty_batches >= 3:
+                print(f"No more new reviews found for {app_name}. Ending scraping for this app.")
+                break
+            time.sleep(REQUEST_DELAY)
+            continue
+
+        empty_batches = 0
+        continuation_token = new_continuation_token
+        matching = review_filter.apply(result)
+        if matching:
+            yield matching
+        if review_filter.is_exhausted(result, sort):
+            print(f"Reached reviews older than {review_filter.start_date} for {app_name}. Ending scraping for this listing.")
+            break
+        time.sleep(REQUEST_DELAY)
+
+class ReviewMerger:
+    """Thread-safe de-duplication of reviews into one app file, flushed in batches.
+
+    Only the compact de-dup keys and the current unflushed batch stay in memory.
+    """
+
+    def __init__(self, app_name, review_filter=None):
+        self.app_name = app_name
+        self.writer = ReviewFileWriter(app_name, review_filter)
+        self.seen_review_ids = set()
+        self.pending_reviews = []
+        self.lock = threading.Lock()
+
+    def add(self, compact):
+        """Add a review unless its review_id was already seen; returns True if it was new."""
+        key = review_dedup_key(compact.review_id)
+        with self.lock:
+            if key in self.seen_review_ids:
+                return False
+            self.seen_review_ids.add(key)
+            self.pending_reviews.append(compact)
+            if len(self.pending_reviews) >= FLUSH_BATCH_SIZE:
+                self._flush()
+            return True
+
+    def _flush(self):
+        self.writer.write(r.to_dict() for r in self.pending_reviews)
+        self.pending_reviews.clear()
+
+    def close(self):
+        """Write out what is left and finalise the app's file."""
+        writer = self.writer
+        try:
+            with self.lock:
+                if self.pending_reviews:
+                    self._flush()
+            if writer.count:
+                writer.close()
+                print(f"Saved {writer.count} reviews to {writer.output_file}")
+                print(f"--- Finished scraping for {self.app_name}. Total reviews: {writer.count} ---")
+            else:
+                writer.discard()
+                print(f"--- No reviews collected for {self.app_name} ---")
+        except Exception as e:
+            print(f"Error saving reviews to file: {str(e)}")
+            writer.discard()
+
+def scrape_listing(app_name, app_id, merger, source=DEFAULT_SOURCE, tag_source=False,
+                   review_filter=None):
+    """Scrape one (lang, country, sort) listing of an app into a ReviewMerger.
+
+    Stops once the listing has contributed TARGET_REVIEW_COUNT new reviews.
+    Returns the number of reviews it added.
+    """
+    lang, country, sort = source
+    label = f"{app_name} [{lang}-{country}, {sort}]" if tag_source else app_name
+    current_reviews_count = 0
+    no_new_reviews_count = 0
+
+    for result in iter_review_batches(app_name, app_id, lang=lang, country=country, sort=sort,
+                                      review_filter=review_filter):
+        new_reviews_added = False
+
+        for review in result:
+            if not should_continue or current_reviews_count >= TARGET_REVIEW_COUNT:
                 break
+
+            compact = compact_review(review)
+            if compact is None:
+                continue
+            if tag_source:
+                compact.source = source
+            if merger.add(compact):
+                current_reviews_count += 1
+                new_reviews_added = True
+                print(f"Scraped review {current_reviews_count}/{TARGET_REVIEW_COUNT} for {label} (Date: {compact.date})")
+
+        if not should_continue or current_reviews_count >= TARGET_REVIEW_COUNT:
+            break
+
+        if new_reviews_added:
+            no_new_reviews_count = 0
+        else:
+            no_new_reviews_count += 1
+            if no_new_reviews_count >= 3:
+                print(f"No more new reviews found for {label}. Ending scraping for this listing.")
+                break
+
+    return current_reviews_count
+
+def _start_app(app_name, app_id, review_filter):
+    """Print the run banner and verify the app exists; returns False if it should be skipped."""
+    print(f"\n--- Starting scraping for {app_name} (ID: {app_id}) ---")
+    print(f"Play Store URL: https://play.google.com/store/apps/details?id={app_id}&hl=en_IN")
+    print(f"Scraping reviews from {review_filter.start_date} to {review_filter.end_date or 'present'} "
+          f"(Target: {TARGET_REVIEW_COUNT} reviews)")
+    if review_filter.to_dict() != default_review_filter().to_dict():
+        print(f"Filter: {review_filter}")
+    
+    # Verify app exists first
+    exists, actual_app_name = verify_app_exists(app_id)
+    if not exists:
+        print(f"App {app_name} (ID: {app_id}) not found in Google Play Store. Skipping...")
+        return False
     
-    if all_reviews:
-        save_reviews_to_json(app_name, all_reviews)
-        print(f"--- Finished scraping for {app_name}. Total reviews: {len(all_reviews)} ---")
-    else:
-        print(f"--- No reviews collected for {app_name} ---")
+    if actual_app_name != app_name:
+        print(f"Note: App name in Play Store is '{actual_app_name}', different from provided name '{app_name}'")
+    return True
+
+def scrape_app_reviews(app_name, app_id, review_filter=None, source=DEFAULT_SOURCE):
+    """Scrapes user reviews for a given app from Google Play Store."""
+    review_filter = resolve_review_filter(review_filter)
+    if not _start_app(app_name, app_id, review_filter):
+        return
+
+    merger = ReviewMerger(app_name, review_filter)
+    try:
+        scrape_listing(app_name, app_id, merger, source, review_filter=review_filter)
+    finally:
+        merger.close()
+
+def get_fanout_sources(locales=None, sorts=None):
+    """All (lang, country, sort) combinations to scrape in fan-out mode."""
+    return [(lang, country, sort)
+            for lang, country in (locales or FANOUT_LOCALES)
+            for sort in (sorts or FANOUT_SORTS)]
+
+def scrape_app_reviews_fanout(app_name, app_id, sources=None, review_filter=None):
+    """Scrape several locale/sort listings of an app in parallel into one merged file.
+
+    Reviews are de-duplicated by review_id across listings and tagged with a
+    `source` field naming the listing they were first seen in.
+    """
+    from concurrent.futures import ThreadPoolExecutor  # Pulls in logging; only fan-out needs it
+
+    review_filter = resolve_review_filter(review_filter)
+    if not _start_app(app_name, app_id, review_filter):
+        return
+
+    sources = sources or get_fanout_sources()
+    workers = min(len(sources), FANOUT_MAX_WORKERS)
+    print(f"Fanning out over {len(sources)} listings with {workers} workers")
+    merger = ReviewMerger(app_name, review_filter)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(scrape_listing, app_name, app_id, merger, source, True, review_filter): source
+                for source in sources
+            }
+            for future, source in futures.items():
+                try:
+                    added = future.result()
+                    print(f"Listing {'/'.join(source)} added {added} new reviews for {app_name}")
+                except Exception as e:
+                    print(f"Error scraping listing {'/'.join(source)} for {app_name}: {str(e)}")
+    finally:
+        merger.close()
+
+def count_saved_reviews(output_file):
+    """Return the review count recorded in a saved file without loading its reviews."""
+    # total_reviews is written after the reviews array, so it sits near the end of the file
+    with open(output_file, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - 4096))
+        tail = f.read().decode('utf-8', errors='ignore')
+    match = re.search(r'"total_reviews":\s*(\d+)', tail)
+    if match:
+        return int(match.group(1))
+    with open(output_file, 'r', encoding='utf-8') as f:
+        return len(json.load(f).get('reviews', []))
 
 def is_app_already_scraped(app_name_key):
     """Check if reviews for an app have already been scraped."""
     output_file = get_output_file(app_name_key)
     if os.path.exists(output_file):
         try:
-            with open(output_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if len(data.get('reviews', [])) >= TARGET_REVIEW_COUNT:
-                    print(f"\nSkipping {app_name_key} - already scraped {len(data['reviews'])} reviews")
-                    return True
+            saved_count = count_saved_reviews(output_file)
+            if saved_count >= TARGET_REVIEW_COUNT:
+                print(f"\nSkipping {app_name_key} - already scraped {saved_count} reviews")
+                return True
         except Exception as e:
             print(f"Error checking existing reviews for {app_name_key}: {str(e)}")
     return False
 
+def scrape_apps(app_ids=None, fanout=False, review_filter=None):
+    """Scrape every app (default: APP_IDS) that has not reached TARGET_REVIEW_COUNT yet.
+
+    fanout scrapes every FANOUT_LOCALES x FANOUT_SORTS listing per app; review_filter
+    defaults to the configured one (see default_review_filter).
+    """
+    scrape = scrape_app_reviews_fanout if fanout else scrape_app_reviews
+    create_output_directory()
+    for app_name, app_id in (app_ids or APP_IDS).items():
+        if not should_continue:
+            break
+        if not is_app_already_scraped(app_name):
+            scrape(app_name, app_id, review_filter=review_filter)
+        else:
+            print(f"Skipping {app_name} as it has already been scraped")
+
 if __name__ == "__main__":
     # Set up signal handlers
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
     
     try:
-        create_output_directory()
-        for app_name, app_id in APP_IDS.items():
-            if not should_continue:
-                break
-            if not is_app_already_scraped(app_name):
-                scrape_app_reviews(app_name, app_id)
-            else:
-                print(f"Skipping {app_name} as it has already been scraped")
+        scrape_apps(fanout="--fanout" in sys.argv[1:])
         print("\nAll scraping complete!")
     except KeyboardInterrupt:
         print("\nScript interrupted by user. Exiting gracefully...")
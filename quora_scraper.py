@@ -2,54 +2,14 @@ import time
 import json
 import os
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import signal
 import sys
+import config
 
 # Configuration
 OUTPUT_FILE = "quora_discussions.json"
-SEARCH_KEYWORDS = [
-    # App-specific keywords
-    "Rapido app review",
-    "Swiggy delivery experience",
-    "Zomato food delivery",
-    "Ekart delivery service",
-    "Shiprocket logistics",
-    "Delhivery tracking",
-    "Amazon shopping app",
-    "Flipkart online shopping",
-    "Tata Neu app",
-    "BookMyShow tickets",
-    "RedBus booking",
-    "IRCTC train booking",
-    "ConfirmTkt app",
-    "JioMart grocery",
-    "Zepto quick delivery",
-    "Blinkit grocery delivery",
-    "MakeMyTrip booking",
-    
-    # General keywords
-    "food delivery apps India",
-    "best grocery delivery app",
-    "online shopping apps",
-    "train booking apps",
-    "movie ticket booking apps",
-    "logistics tracking apps",
-    "quick delivery services",
-    "e-commerce delivery",
-    "ride sharing apps",
-    "bike taxi services",
-    "auto booking apps",
-    "cab booking apps",
-    "last mile delivery",
-    "same day delivery",
-    "instant delivery services"
-]
+# Search keywords are shared in config.json
+SEARCH_KEYWORDS = config.get_section("quora")["search_keywords"]
 
 MAX_QUESTIONS_PER_KEYWORD = 50
 MAX_ANSWERS_PER_QUESTION = 20
@@ -86,6 +46,9 @@ def save_discussions_to_json(all_discussions):
 
 def setup_driver():
     """Set up and return a configured Chrome WebDriver."""
+    # selenium is imported by the functions that drive the browser, not at module load
+    from selenium import webdriver
+
     options = webdriver.ChromeOptions()
     options.add_argument('--headless')  # Run in headless mode
     options.add_argument('--no-sandbox')
@@ -112,6 +75,9 @@ def scroll_to_bottom(driver):
 
 def extract_question_data(question_element):
     """Extract data from a question element."""
+    from selenium.webdriver.common.by import By
+    from selenium.common.exceptions import NoSuchElementException
+
     try:
         question_text = question_element.find_element(By.CSS_SELECTOR, "div.q-box.qu-display--block").text
         question_url = question_element.find_element(By.CSS_SELECTOR, "a").get_attribute("href")
@@ -132,10 +98,37 @@ def extract_question_data(question_element):
         print(f"Error extracting question data: {str(e)}")
         return None
 
+def scrape_keyword_discussions(driver, keyword):
+    """Search Quora for one keyword and extract the questions on the results page."""
+    from selenium.webdriver.common.by import By
+
+    discussions = []
+    
+    # Search for the keyword
+    driver.get("https://www.quora.com/search?q=" + keyword.replace(" ", "+"))
+    time.sleep(SCROLL_PAUSE_TIME)
+    
+    # Scroll to load more questions
+    for _ in range(3):  # Scroll 3 times to load more content
+        scroll_to_bottom(driver)
+    
+    # Extract questions
+    question_elements = driver.find_elements(By.CSS_SELECTOR, "div.q-box.qu-display--block")
+    
+    for element in question_elements[:MAX_QUESTIONS_PER_KEYWORD]:
+        if not should_continue:
+            break
+            
+        question_data = extract_question_data(element)
+        if question_data:
+            discussions.append(question_data)
+            print(f"Found question: {question_data['question'][:100]}...")
+    
+    return discussions
+
 def scrape_quora_discussions():
     """Main function to scrape Quora discussions."""
     driver = setup_driver()
-    wait = WebDriverWait(driver, 10)
     all_discussions = {}
     
     try:
@@ -144,27 +137,7 @@ def scrape_quora_discussions():
                 break
                 
             print(f"\nSearching for discussions about: {keyword}")
-            discussions = []
-            
-            # Search for the keyword
-            driver.get("https://www.quora.com/search?q=" + keyword.replace(" ", "+"))
-            time.sleep(SCROLL_PAUSE_TIME)
-            
-            # Scroll to load more questions
-            for _ in range(3):  # Scroll 3 times to load more content
-                scroll_to_bottom(driver)
-            
-            # Extract questions
-            question_elements = driver.find_elements(By.CSS_SELECTOR, "div.q-box.qu-display--block")
-            
-            for element in question_elements[:MAX_QUESTIONS_PER_KEYWORD]:
-                if not should_continue:
-                    break
-                    
-                question_data = extract_question_data(element)
-                if question_data:
-                    discussions.append(question_data)
-                    print(f"Found question: {question_data['question'][:100]}...")
+            discussions = scrape_keyword_discussions(driver, keyword)
             
             if discussions:
                 all_discussions[keyword] = discussions
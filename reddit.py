@@ -1,52 +1,23 @@
-import requests
 import json
 import time
 import os
 import random
 from datetime import datetime
+import config
 
 # Configuration
-APPS = [
-    "Amazon Shopping",
-    "Flipkart Online Shopping",
-    "BookMyShow"
-]
+# Apps, keyword categories and subreddits are shared in config.json
+REDDIT_CONFIG = config.get_section("reddit")
+APPS = REDDIT_CONFIG["apps"]
 
 # Keywords for specific categories
-KEYWORDS = {
-    "GroupBooking": "group ticket booking BookMyShow",
-    "RedBusGroup": "group booking experience RedBus",
-    "AITravel": "generative AI for travel booking",
-    "ChatbotTickets": "chatbot ticket booking app",
-    "AIAutoBooking": "auto book tickets using AI"
-}
+KEYWORDS = REDDIT_CONFIG["keywords"]
 
 OUTPUT_DIR = "reddit_conversations"
 
 # Reddit API configuration
 REDDIT_API_URL = "https://www.reddit.com/r/{subreddit}/search.json"
-SUBREDDITS = [
-    "india",
-    "indiaspeaks",
-    "IndianGaming",
-    "developersIndia",
-    "indiaTech",
-    "StartUpIndia",
-    "IndianStreetBets",
-    "IndianGamers",
-    "IndianGamingDeals",
-    "IndiaSpeaks",
-    "IndianTeenagers",
-    "IndianFood",
-    "IndianFashionAddicts",
-    "IndianCinema",
-    "IndianGaming",
-    "IndianGamingDeals",
-    "IndianGamingMarketplace",
-    "IndianGamingDeals",
-    "IndianGamingMarketplace",
-    "IndianGamingDeals"
-]
+SUBREDDITS = REDDIT_CONFIG["subreddits"]
 
 # User agents for rotation
 USER_AGENTS = [
@@ -74,6 +45,8 @@ def create_output_directory():
 
 def search_reddit_posts(subreddit, query, limit=100):
     """Search for posts in a subreddit using Reddit's API."""
+    import requests
+
     url = REDDIT_API_URL.format(subreddit=subreddit)
     params = {
         "q": query,
@@ -107,6 +80,8 @@ def search_reddit_posts(subreddit, query, limit=100):
 
 def fetch_reddit_thread_json(thread_id):
     """Fetch a Reddit thread's JSON data."""
+    import requests
+
     url = f"https://www.reddit.com/comments/{thread_id}.json"
     
     max_retries = 3
@@ -173,6 +148,44 @@ def extract_reddit_conversation(thread_data, max_comments=200):
         'url': post['permalink']
     }
 
+def scrape_subreddit_conversations(subreddit, query, seen_threads=None, wait=None):
+    """Search one subreddit for a query and extract the conversation of every new thread."""
+    if seen_threads is None:
+        seen_threads = set()
+    if wait is None:
+        # Random delay between thread fetches
+        wait = lambda: time.sleep(random.uniform(2, 4))
+
+    conversations = []
+
+    # Search for posts
+    posts_data = search_reddit_posts(subreddit, query)
+    if not posts_data:
+        return None
+
+    # Process each post
+    for post in posts_data['data']['children']:
+        thread_id = post['data']['id']
+
+        if thread_id in seen_threads:
+            continue
+
+        seen_threads.add(thread_id)
+
+        # Fetch thread data
+        wait()
+        thread_data = fetch_reddit_thread_json(thread_id)
+        if not thread_data:
+            continue
+
+        # Extract conversation
+        conversation = extract_reddit_conversation(thread_data)
+        if conversation:
+            conversations.append(conversation)
+            print(f"Found conversation with {len(conversation['comments'])} comments")
+
+    return conversations
+
 def scrape_reddit_conversations_for_app(app_name):
     """Scrape Reddit conversations for a specific app."""
     print(f"\n--- Scraping Reddit conversations for {app_name} ---")
@@ -183,33 +196,10 @@ def scrape_reddit_conversations_for_app(app_name):
     for subreddit in SUBREDDITS:
         print(f"Searching in r/{subreddit}...")
         
-        # Search for posts
-        posts_data = search_reddit_posts(subreddit, app_name)
-        if not posts_data:
+        subreddit_conversations = scrape_subreddit_conversations(subreddit, app_name, seen_threads)
+        if subreddit_conversations is None:
             continue
-        
-        # Process each post
-        for post in posts_data['data']['children']:
-            thread_id = post['data']['id']
-            
-            if thread_id in seen_threads:
-                continue
-            
-            seen_threads.add(thread_id)
-            
-            # Fetch thread data
-            thread_data = fetch_reddit_thread_json(thread_id)
-            if not thread_data:
-                continue
-            
-            # Extract conversation
-            conversation = extract_reddit_conversation(thread_data)
-            if conversation:
-                conversations.append(conversation)
-                print(f"Found conversation with {len(conversation['comments'])} comments")
-            
-            # Random delay between thread fetches
-            time.sleep(random.uniform(2, 4))
+        conversations.extend(subreddit_conversations)
         
         # Random delay between subreddits
         time.sleep(random.uniform(5, 8))
@@ -283,35 +273,13 @@ def scrape_reddit_by_keywords():
         for subreddit in SUBREDDITS:
             print(f"Searching in r/{subreddit}...")
             
-            # Search for posts
-            posts_data = search_reddit_posts(subreddit, keyword)
-            if not posts_data:
+            subreddit_conversations = scrape_subreddit_conversations(subreddit, keyword, seen_threads)
+            if subreddit_conversations is None:
                 continue
-            
-            # Process each post
-            for post in posts_data['data']['children']:
-                thread_id = post['data']['id']
-                
-                if thread_id in seen_threads:
-                    continue
-                
-                seen_threads.add(thread_id)
-                
-                # Fetch thread data
-                thread_data = fetch_reddit_thread_json(thread_id)
-                if not thread_data:
-                    continue
-                
-                # Extract conversation
-                conversation = extract_reddit_conversation(thread_data)
-                if conversation:
-                    conversation['category'] = category
-                    conversation['keyword'] = keyword
-                    category_conversations.append(conversation)
-                    print(f"Found conversation with {len(conversation['comments'])} comments")
-                
-                # Random delay between thread fetches
-                time.sleep(random.uniform(2, 4))
+            for conversation in subreddit_conversations:
+                conversation['category'] = category
+                conversation['keyword'] = keyword
+            category_conversations.extend(subreddit_conversations)
             
             # Random delay between subreddits
             time.sleep(random.uniform(5, 8))
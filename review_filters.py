@@ -0,0 +1,120 @@
+from datetime import date, datetime
+
+class ReviewFilter:
+    """Declarative filter over raw google_play_scraper review dicts.
+
+    Filters run on the raw pages as they come back from reviews(), before any
+    formatting, and also tell the pager when a sort order guarantees that no
+    later page can match (see is_exhausted).
+
+    Any criterion left as None is not applied:
+        start_date / end_date  inclusive date range on the review's `at`
+        scores                 iterable of allowed star ratings
+        min_thumbs_up          minimum thumbsUpCount
+        version_prefix         reviewCreatedVersion must start with this
+    """
+
+    def __init__(self, start_date=None, end_date=None, scores=None, min_thumbs_up=None,
+                 version_prefix=None):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.scores = frozenset(scores) if scores is not None else None
+        self.min_thumbs_up = min_thumbs_up
+        self.version_prefix = version_prefix
+
+    @classmethod
+    def from_dict(cls, config):
+        """Build a filter from a plain dict, e.g. one loaded from JSON config."""
+        config = dict(config or {})
+        for key in ('start_date', 'end_date'):
+            if isinstance(config.get(key), str):
+                config[key] = date.fromisoformat(config[key])
+        return cls(**config)
+
+    def to_dict(self):
+        """The criteria that are set, as a JSON-friendly dict that from_dict reads back."""
+        config = {}
+        for key, value in vars(self).items():
+            if value is None:
+                continue
+            if isinstance(value, date):
+                value = value.isoformat()
+            elif isinstance(value, frozenset):
+                value = sorted(value)
+            config[key] = value
+        return config
+
+    def replace(self, **changes):
+        """A copy of this filter with some criteria changed."""
+        return type(self)(**{**vars(self), **changes})
+
+    def __repr__(self):
+        fields = ', '.join(f"{k}={v!r}" for k, v in vars(self).items() if v is not None)
+        return f"ReviewFilter({fields})"
+
+    @property
+    def server_score(self):
+        """The score google_play_scraper can filter on server-side, if exactly one is allowed."""
+        if self.scores is not None and len(self.scores) == 1:
+            return next(iter(self.scores))
+        return None
+
+    def matches(self, review):
+        """Check a raw review against every criterion."""
+        review_date = review.get('at')
+        if not isinstance(review_date, datetime):
+            return False
+        if self.start_date is not None and review_date.date() < self.start_date:
+            return False
+        if self.end_date is not None and review_date.date() > self.end_date:
+            return False
+        if self.scores is not None and review.get('score') not in self.scores:
+            return False
+        if self.min_thumbs_up is not None and (review.get('thumbsUpCount') or 0) < self.min_thumbs_up:
+            return False
+        if self.version_prefix is not None:
+            version = review.get('reviewCreatedVersion') or ''
+            if not version.startswith(self.version_prefix):
+                return False
+        return True
+
+    def apply(self, batch):
+        """Return the reviews in a raw batch that match."""
+        return [review for review in batch if self.matches(review)]
+
+    def is_exhausted(self, batch, sort):
+        """True if, given the sort order, no page after this batch can match.
+
+        Only NEWEST gives an ordering guarantee: once the oldest review in a
+        page is before start_date, every later page is older still.
+        """
+        if sort != 'NEWEST' or self.start_date is None or not batch:
+            return False
+        dates = [r['at'] for r in batch if isinstance(r.get('at'), datetime)]
+        return bool(dates) and min(dates).date() < self.start_date
+
+# Command-line flag for each ReviewFilter criterion
+FILTER_FLAGS = {
+    'start_date': '--since',
+    'end_date': '--until',
+    'scores': '--score',
+    'min_thumbs_up': '--min-thumbs-up',
+    'version_prefix': '--version-prefix',
+}
+
+def add_filter_arguments(parser):
+    """Add the command-line flags that build a ReviewFilter; see filter_overrides."""
+    group = parser.add_argument_group("review filter (Play Store)")
+    group.add_argument('--since', dest='start_date', type=date.fromisoformat, metavar='YYYY-MM-DD',
+                       help="Only reviews on or after this date")
+    group.add_argument('--until', dest='end_date', type=date.fromisoformat, metavar='YYYY-MM-DD',
+                       help="Only reviews on or before this date")
+    group.add_argument('--score', dest='scores', type=int, action='append', choices=range(1, 6),
+                       help="Allowed star rating (repeatable)")
+    group.add_argument('--min-thumbs-up', type=int, metavar='N')
+    group.add_argument('--version-prefix', metavar='PREFIX', help="App version the review was written on")
+    return group
+
+def filter_overrides(args):
+    """The filter criteria given on the command line, as a dict for ReviewFilter.from_dict."""
+    return {key: getattr(args, key) for key in FILTER_FLAGS if getattr(args, key, None) is not None}
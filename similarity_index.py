@@ -0,0 +1,719 @@
+import os
+import re
+import sys
+import json
+import math
+import zlib
+import argparse
+from pathlib import Path
+from functools import lru_cache
+
+import numpy as np
+
+# Configuration
+INDEX_DIR = "similarity_index"
+CLEANED_REVIEWS_DIR = "cleaned_reviews"
+REDDIT_DIR = "reddit_conversations"
+QUORA_FILE = "quora_discussions.json"
+
+DIM = 128  # Width of the LSA embeddings the index stores and searches
+HASHED_DIM = 512  # Width of embed_texts' feature-hashing vectors; must be a power of two
+HASH_SPACE = 2 ** 20  # Buckets features are hashed into; wide enough that collisions are rare
+VOCAB_SIZE = 4096  # Most frequent hash buckets in the training sample that the projection covers
+POWER_ITERATIONS = 6  # Subspace iterations when fitting the projection
+PROJECTION_CHUNK = 2048  # Training texts densified at a time while fitting the projection
+NLIST = 1024  # Maximum number of IVF lists (coarse clusters)
+NPROBE = 16  # Lists scanned per query until the index has been calibrated
+TARGET_RECALL = 0.9  # Recall@10 against brute force that calibration picks nprobe for
+CALIBRATION_QUERIES = 200  # Indexed documents used as calibration queries
+TRAIN_SAMPLE = 50000  # Documents, balanced across sources, that IDF and the coarse centroids are fitted on
+KMEANS_ITERATIONS = 15
+ADD_BATCH_SIZE = 10000  # Documents embedded and appended per step while building
+SEED = 42
+
+# Document sources, stored as one byte per row so queries can filter by source
+SOURCES = ["playstore", "reddit", "quora"]
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have i if in is it its me my not of on or so that the
+this to was we were will with you your they them he she his her our us do does did just very
+""".split())
+
+TOKEN_RE = re.compile(r"\w+")
+
+# ---------------------------------------------------------------------------
+# Embedding
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=200000)
+def _feature(token):
+    """Stable hash bucket, feature-hashing index and sign for a token.
+
+    Uses crc32 rather than hash() so every process maps a token the same way.
+    """
+    h = zlib.crc32(token.encode('utf-8'))
+    bucket = h & (HASH_SPACE - 1)
+    return bucket, bucket & (HASHED_DIM - 1), 1.0 if (h >> 31) & 1 else -1.0
+
+def _features(text):
+    """Log-scaled counts of a text's unigrams and bigrams, keyed by _feature()."""
+    tokens = [t for t in TOKEN_RE.findall((text or '').lower()) if t not in STOPWORDS]
+    counts = {}
+    for token in tokens:
+        counts[token] = counts.get(token, 0) + 1
+    for first, second in zip(tokens, tokens[1:]):
+        bigram = f"{first} {second}"
+        counts[bigram] = counts.get(bigram, 0) + 1
+    return [(_feature(token), 1.0 + math.log(count)) for token, count in counts.items()]
+
+def document_frequencies(texts):
+    """Number of texts each hash bucket occurs in."""
+    df = np.zeros(HASH_SPACE, dtype=np.int32)
+    for text in texts:
+        buckets = {bucket for (bucket, _, _), _ in _features(text)}
+        df[list(buckets)] += 1
+    return df
+
+def idf_weights(df, count):
+    """Smoothed inverse document frequency from document frequencies over count texts."""
+    return (np.log((1 + count) / (1 + df)) + 1).astype(np.float32)
+
+def fit_idf(texts):
+    """Smoothed inverse document frequency for every hash bucket."""
+    return idf_weights(document_frequencies(texts), len(texts))
+
+def _embed_into(text, out, idf):
+    for (bucket, index, sign), tf in _features(text):
+        weight = tf if idf is None else tf * idf[bucket]
+        out[index] += sign * weight
+    norm = np.linalg.norm(out)
+    if norm:
+        out /= norm
+
+def embed_text(text, idf=None):
+    """Signed feature-hashing TF-IDF embedding of a text's unigrams and bigrams.
+
+    The result is an L2-normalised float32 vector of length HASHED_DIM. The
+    index does not use these: folding every feature into HASHED_DIM buckets
+    makes unrelated texts similar whenever two of their features collide.
+    """
+    vector = np.zeros(HASHED_DIM, dtype=np.float32)
+    _embed_into(text, vector, idf)
+    return vector
+
+def embed_texts(texts, idf=None):
+    """Embed many texts into an (n, HASHED_DIM) float32 matrix."""
+    matrix = np.zeros((len(texts), HASHED_DIM), dtype=np.float32)
+    for i, text in enumerate(texts):
+        _embed_into(text, matrix[i], idf)
+    return matrix
+
+# ---------------------------------------------------------------------------
+# LSA projection
+# ---------------------------------------------------------------------------
+
+def vocabulary_columns(vocab):
+    """Lookup from hash bucket to projection row, -1 for buckets outside the vocabulary."""
+    columns = np.full(HASH_SPACE, -1, dtype=np.int32)
+    columns[vocab] = np.arange(len(vocab), dtype=np.int32)
+    return columns
+
+def _weighted_columns(text, columns, idf):
+    """Projection rows of a text's in-vocabulary features and their unit-length TF-IDF weights."""
+    rows = []
+    weights = []
+    for (bucket, _, _), tf in _features(text):
+        column = columns[bucket]
+        if column >= 0:
+            rows.append(column)
+            weights.append(tf * idf[bucket])
+    weights = np.array(weights, dtype=np.float32)
+    norm = np.linalg.norm(weights)
+    return np.array(rows, dtype=np.int64), weights / norm if norm else weights
+
+def fit_projection(texts, idf, vocab, dim=DIM, seed=SEED):
+    """Top `dim` LSA components of the texts' TF-IDF vectors over vocab, as a (len(vocab), dim) matrix.
+
+    The components are the leading eigenvectors of the vocabulary's Gram
+    matrix, found by seeded randomized subspace iteration so a build does not
+    need a full eigendecomposition.
+    """
+    columns = vocabulary_columns(vocab)
+    gram = np.zeros((len(vocab), len(vocab)), dtype=np.float32)
+    for start in range(0, len(texts), PROJECTION_CHUNK):
+        chunk = np.zeros((min(PROJECTION_CHUNK, len(texts) - start), len(vocab)), dtype=np.float32)
+        for i, text in enumerate(texts[start:start + PROJECTION_CHUNK]):
+            rows, weights = _weighted_columns(text, columns, idf)
+            np.add.at(chunk[i], rows, weights)
+        gram += chunk.T @ chunk
+
+    rng = np.random.default_rng(seed)
+    basis = rng.standard_normal((len(vocab), min(len(vocab), dim + 16))).astype(np.float32)
+    for _ in range(POWER_ITERATIONS):
+        basis, _ = np.linalg.qr(gram @ basis)
+    _, vectors = np.linalg.eigh(basis.T @ gram @ basis)
+    leading = (basis @ vectors[:, ::-1])[:, :dim]
+    components = np.zeros((len(vocab), dim), dtype=np.float32)
+    components[:, :leading.shape[1]] = leading
+    return components
+
+def project_texts(texts, idf, columns, components):
+    """LSA embeddings of texts as an (n, dim) matrix of unit rows; texts with no known feature stay zero."""
+    matrix = np.zeros((len(texts), components.shape[1]), dtype=np.float32)
+    for i, text in enumerate(texts):
+        rows, weights = _weighted_columns(text, columns, idf)
+        if len(rows):
+            vector = weights @ components[rows]
+            norm = np.linalg.norm(vector)
+            if norm:
+                matrix[i] = vector / norm
+    return matrix
+
+# ---------------------------------------------------------------------------
+# Coarse quantiser
+# ---------------------------------------------------------------------------
+
+def train_centroids(vectors, nlist, iterations=KMEANS_ITERATIONS, seed=SEED):
+    """Spherical k-means: unit-length centroids for cosine similarity."""
+    rng = np.random.default_rng(seed)
+    nlist = max(1, min(nlist, len(vectors)))
+    centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, vectors)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        empty = norms[:, 0] == 0
+        # Re-seed empty lists from random vectors so every list stays in use
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+        norms[empty] = 1.0
+        centroids = (sums / norms).astype(np.float32)
+    return centroids
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+class SimilarityIndex:
+    """IVF nearest-neighbour index over LSA text embeddings, kept on disk.
+
+    Texts are TF-IDF weighted unigrams and bigrams hashed into HASH_SPACE,
+    projected onto DIM latent components fitted on the training sample.
+
+    Layout of the index directory:
+        meta.json        dimensions, list count, document count and calibrated nprobe
+        idf.npy          IDF weights per hash bucket, fitted on the training sample
+        vocab.npy        the VOCAB_SIZE hash buckets the projection covers
+        components.npy   (len(vocab), DIM) LSA projection
+        centroids.npy    (nlist, DIM) coarse centroids
+        vectors.f32      (n, DIM) embeddings, appended and memory-mapped
+        lists.i32        IVF list of each row
+        sources.u8       source code of each row (index into SOURCES)
+        docs.jsonl       one metadata record per row
+        offsets.i64      byte offset of each row's docs.jsonl record
+        list_rows.i64    row ids ordered by IVF list, written by save_inverted_lists
+        list_starts.i64  where each list starts in list_rows.i64
+
+    Everything is append-only, so documents can be added incrementally; the
+    per-row files are opened with np.memmap so only the lists a query probes
+    are read from disk.
+    """
+
+    def __init__(self, path=INDEX_DIR):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.meta = {"dim": DIM, "count": 0}
+        if (self.path / "meta.json").exists():
+            with open(self.path / "meta.json", 'r', encoding='utf-8') as f:
+                self.meta = json.load(f)
+            if self.meta["dim"] != DIM:
+                raise ValueError(f"Index at {path} was built with dim={self.meta['dim']}, not {DIM}")
+        centroids_file = self.path / "centroids.npy"
+        self.centroids = np.load(centroids_file) if centroids_file.exists() else None
+        idf_file = self.path / "idf.npy"
+        self.idf = np.load(idf_file, mmap_mode='r') if idf_file.exists() else None
+        vocab_file = self.path / "vocab.npy"
+        self.vocab = np.load(vocab_file) if vocab_file.exists() else None
+        components_file = self.path / "components.npy"
+        self.components = np.load(components_file) if components_file.exists() else None
+        self._columns = None
+        self._ids = None
+        self._maps = None
+        self._list_rows = None
+
+    @property
+    def count(self):
+        return self.meta["count"]
+
+    def _file(self, name):
+        return self.path / name
+
+    def _save_meta(self):
+        with open(self._file("meta.json"), 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, indent=4)
+
+    def _known_ids(self):
+        """Ids of every indexed document, loaded on first add so re-adding is a no-op."""
+        if self._ids is None:
+            self._ids = set()
+            docs_file = self._file("docs.jsonl")
+            if docs_file.exists():
+                with open(docs_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        self._ids.add(json.loads(line)["id"])
+        return self._ids
+
+    def _append(self, name, array):
+        with open(self._file(name), 'ab') as f:
+            f.write(np.ascontiguousarray(array).tobytes())
+
+    @property
+    def trained(self):
+        return self.components is not None and self.centroids is not None
+
+    def embed(self, texts):
+        """Embed texts into the index's (n, DIM) LSA space."""
+        if self._columns is None:
+            self._columns = vocabulary_columns(self.vocab)
+        return project_texts(texts, self.idf, self._columns, self.components)
+
+    def _fit_embedding(self, texts):
+        """Fit IDF, the vocabulary and the LSA projection on a sample of texts."""
+        df = document_frequencies(texts)
+        self.idf = idf_weights(df, len(texts))
+        vocab = np.argsort(-df, kind='stable')[:min(VOCAB_SIZE, np.count_nonzero(df))]
+        self.vocab = vocab.astype(np.int64)
+        self.components = fit_projection(texts, self.idf, self.vocab)
+        self._columns = None
+        np.save(self._file("idf.npy"), self.idf)
+        np.save(self._file("vocab.npy"), self.vocab)
+        np.save(self._file("components.npy"), self.components)
+
+    def train(self, texts, expected_count=None):
+        """Fit the embedding (IDF and LSA projection) and coarse centroids on a sample of texts.
+
+        The sample should cover every source (see sample_training_texts); the
+        list count is sized for expected_count documents, or for the sample.
+        """
+        self._fit_embedding(texts)
+        vectors = self.embed(texts)
+        self.centroids = train_centroids(vectors, self._target_nlist(expected_count or len(texts)))
+        np.save(self._file("centroids.npy"), self.centroids)
+        self.meta["nlist"] = len(self.centroids)
+        self._save_meta()
+
+    def add(self, docs):
+        """Add documents: dicts with `id`, `source`, `text` and any extra metadata.
+
+        Documents whose id is already indexed are skipped. An index that has not
+        been trained is trained on this first batch; build_index trains on a
+        sample of every source first. The embedding and centroids then stay
+        fixed so existing vectors remain valid, until retrain().
+        """
+        known = self._known_ids()
+        batch = []
+        for doc in docs:
+            if doc["id"] in known or not doc.get("text"):
+                continue
+            known.add(doc["id"])
+            batch.append(doc)
+        if not batch:
+            return 0
+
+        texts = [doc["text"] for doc in batch]
+        if not self.trained:
+            self.train(texts[:TRAIN_SAMPLE])
+        vectors = self.embed(texts)
+
+        lists = np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+        sources = np.array([SOURCES.index(doc["source"]) for doc in batch], dtype=np.uint8)
+
+        docs_file = self._file("docs.jsonl")
+        offset = docs_file.stat().st_size if docs_file.exists() else 0
+        offsets = []
+        with open(docs_file, 'ab') as f:
+            for doc in batch:
+                line = (json.dumps(doc, ensure_ascii=False) + "\n").encode('utf-8')
+                offsets.append(offset)
+                f.write(line)
+                offset += len(line)
+
+        self._append("vectors.f32", vectors)
+        self._append("lists.i32", lists)
+        self._append("sources.u8", sources)
+        self._append("offsets.i64", np.array(offsets, dtype=np.int64))
+        self.meta["count"] += len(batch)
+        self._save_meta()
+
+        # Memory maps and the list directory are rebuilt on the next query
+        self._maps = None
+        self._list_rows = None
+        return len(batch)
+
+    def _target_nlist(self, count=None):
+        return min(NLIST, max(1, int(math.sqrt(self.count if count is None else count))))
+
+    def needs_retrain(self):
+        """True once the index has grown enough that its lists are much too long."""
+        return self.centroids is not None and self._target_nlist() > 2 * len(self.centroids)
+
+    def iter_documents(self):
+        """Every indexed document's metadata record, in row order."""
+        with open(self._file("docs.jsonl"), 'r', encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line)
+
+    def _reembed(self):
+        """Refit the embedding on a balanced sample of the stored texts and re-embed every row."""
+        self._fit_embedding(sample_training_texts(self.iter_documents())[0])
+        partial = self._file("vectors.f32.partial")
+        with open(partial, 'wb') as f:
+            texts = []
+            for doc in self.iter_documents():
+                texts.append(doc["text"])
+                if len(texts) >= ADD_BATCH_SIZE:
+                    f.write(self.embed(texts).tobytes())
+                    texts = []
+            if texts:
+                f.write(self.embed(texts).tobytes())
+        self._maps = None
+        os.replace(partial, self._file("vectors.f32"))
+
+    def retrain(self, refit_idf=True):
+        """Refit the embedding and centroids on a sample of all rows and reassign every row.
+
+        Incremental adds keep the embedding the index was trained with; this
+        re-embeds the stored texts with IDF and a projection fitted on the
+        current corpus and resizes the list count to it so probes stay cheap.
+        """
+        if refit_idf:
+            self._reembed()
+        vectors = self._mapped()["vectors"]
+        rng = np.random.default_rng(SEED)
+        sample_rows = np.sort(rng.choice(self.count, min(self.count, TRAIN_SAMPLE), replace=False))
+        self.centroids = train_centroids(np.asarray(vectors[sample_rows]), self._target_nlist())
+
+        partial = self._file("lists.i32.partial")
+        with open(partial, 'wb') as f:
+            for start in range(0, self.count, ADD_BATCH_SIZE):
+                chunk = np.asarray(vectors[start:start + ADD_BATCH_SIZE])
+                f.write(np.argmax(chunk @ self.centroids.T, axis=1).astype(np.int32).tobytes())
+        self._maps = None
+        self._list_rows = None
+        os.replace(partial, self._file("lists.i32"))
+        np.save(self._file("centroids.npy"), self.centroids)
+        self.meta["nlist"] = len(self.centroids)
+        self.save_inverted_lists()
+
+    def _mapped(self):
+        if self._maps is None:
+            n = self.count
+            self._maps = {
+                "vectors": np.memmap(self._file("vectors.f32"), dtype=np.float32, mode='r', shape=(n, DIM)),
+                "lists": np.memmap(self._file("lists.i32"), dtype=np.int32, mode='r', shape=(n,)),
+                "sources": np.memmap(self._file("sources.u8"), dtype=np.uint8, mode='r', shape=(n,)),
+                "offsets": np.memmap(self._file("offsets.i64"), dtype=np.int64, mode='r', shape=(n,)),
+            }
+        return self._maps
+
+    def _sort_lists(self):
+        lists = self._mapped()["lists"]
+        order = np.argsort(lists, kind='stable').astype(np.int64)
+        starts = np.searchsorted(lists[order], np.arange(len(self.centroids) + 1)).astype(np.int64)
+        return order, starts
+
+    def save_inverted_lists(self):
+        """Persist the rows grouped by IVF list so queries need not sort them on start-up."""
+        order, starts = self._sort_lists()
+        for name, array in (("list_rows.i64", order), ("list_starts.i64", starts)):
+            partial = self._file(name + ".partial")
+            array.tofile(partial)
+            os.replace(partial, self._file(name))
+        self.meta["inverted_count"] = self.count
+        self.meta["inverted_nlist"] = len(self.centroids)
+        self._save_meta()
+        self._list_rows = None
+
+    def _inverted_lists(self):
+        """Row ids grouped by IVF list, plus where each list starts.
+
+        Read from disk when save_inverted_lists covered every row; an index
+        added to since then is sorted in memory instead.
+        """
+        if self._list_rows is None:
+            if (self.meta.get("inverted_count") == self.count
+                    and self.meta.get("inverted_nlist") == len(self.centroids)):
+                self._list_rows = (
+                    np.memmap(self._file("list_rows.i64"), dtype=np.int64, mode='r', shape=(self.count,)),
+                    np.fromfile(self._file("list_starts.i64"), dtype=np.int64),
+                )
+            else:
+                self._list_rows = self._sort_lists()
+        return self._list_rows
+
+    def _exact_neighbours(self, queries, k):
+        """Brute-force top-k rows for each query, scanning the vectors in chunks."""
+        vectors = self._mapped()["vectors"]
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+        for start in range(0, self.count, ADD_BATCH_SIZE):
+            scores = np.asarray(vectors[start:start + ADD_BATCH_SIZE]) @ queries.T
+            rows = np.arange(start, start + len(scores))
+            all_scores = np.hstack([best_scores, scores.T])
+            all_rows = np.hstack([best_rows, np.broadcast_to(rows, (len(queries), len(rows)))])
+            keep = np.argsort(-all_scores, axis=1)[:, :k]
+            best_scores = np.take_along_axis(all_scores, keep, axis=1)
+            best_rows = np.take_along_axis(all_rows, keep, axis=1)
+        return best_rows
+
+    def recall(self, nprobe, query_rows, truth, k=10):
+        """Mean recall@k of IVF search against exact neighbours, ignoring each query's own row."""
+        vectors = self._mapped()["vectors"]
+        hits = 0
+        for row, expected in zip(query_rows, truth):
+            found = {r for _, r in self.search_vector(np.asarray(vectors[row]), k + 1, nprobe)}
+            hits += len((found - {row}) & expected)
+        return hits / (k * len(query_rows))
+
+    def calibrate(self, target=TARGET_RECALL, queries=CALIBRATION_QUERIES, k=10):
+        """Pick the smallest nprobe whose recall@k reaches target and store it as the default.
+
+        How many lists a query must probe depends on how well the corpus
+        clusters, so it is measured on indexed documents rather than fixed.
+        """
+        rng = np.random.default_rng(SEED)
+        query_rows = np.sort(rng.choice(self.count, min(self.count, queries), replace=False))
+        neighbours = self._exact_neighbours(np.asarray(self._mapped()["vectors"][query_rows]), k + 1)
+        truth = [set([int(r) for r in found if r != row][:k]) for row, found in zip(query_rows, neighbours)]
+
+        low, high = 1, len(self.centroids)
+        while low < high:
+            middle = (low + high) // 2
+            if self.recall(middle, query_rows, truth, k) >= target:
+                high = middle
+            else:
+                low = middle + 1
+        self.meta["nprobe"] = low
+        self.meta["calibrated_recall"] = round(self.recall(low, query_rows, truth, k), 3)
+        self._save_meta()
+        return low
+
+    def document(self, row):
+        """Metadata record of an indexed row."""
+        with open(self._file("docs.jsonl"), 'rb') as f:
+            f.seek(int(self._mapped()["offsets"][row]))
+            return json.loads(f.readline())
+
+    def search_vector(self, query, k=10, nprobe=None, source=None):
+        """Return [(score, row)] for the k rows most similar to a unit query vector.
+
+        nprobe defaults to the calibrated value (see calibrate), else NPROBE.
+        """
+        if not self.count:
+            return []
+        nprobe = nprobe or self.meta.get("nprobe", NPROBE)
+        maps = self._mapped()
+        order, starts = self._inverted_lists()
+
+        probe = np.argsort(self.centroids @ query)[::-1][:nprobe]
+        rows = np.concatenate([order[starts[c]:starts[c + 1]] for c in probe])
+        if source is not None:
+            rows = rows[maps["sources"][rows] == SOURCES.index(source)]
+        if not len(rows):
+            return []
+
+        rows.sort()  # Read the memory map front to back
+        scores = maps["vectors"][rows] @ query
+        k = min(k, len(rows))
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(scores[top])[::-1]]
+        return [(float(scores[i]), int(rows[i])) for i in top]
+
+    def search(self, texts, k=10, nprobe=None, source=None):
+        """Find documents similar to one text or to the centroid of several texts."""
+        if isinstance(texts, str):
+            texts = [texts]
+        query = self.embed(list(texts)).mean(axis=0)
+        norm = np.linalg.norm(query)
+        if norm:
+            query /= norm
+        return [dict(self.document(row), score=round(score, 4))
+                for score, row in self.search_vector(query, k, nprobe, source)]
+
+# ---------------------------------------------------------------------------
+# Document loaders
+# ---------------------------------------------------------------------------
+
+def _iter_cleaned_reviews(cleaned_dir):
+    """(app_name, review) from cleaned JSON files and streamed JSON Lines stores."""
+    stream_names = None
+    for file_path in sorted(Path(cleaned_dir).glob('cleaned_reviews_*.json*')):
+        if file_path.suffix == '.jsonl':
+            if stream_names is None:
+                from pipeline import stream_app_names
+                stream_names = stream_app_names()
+            app_name = stream_names.get(file_path.name, file_path.stem)
+            with open(file_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield app_name, json.loads(line)
+        else:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            app_name = data.get('app_name', file_path.stem)
+            for review in data.get('reviews', []):
+                yield app_name, review
+
+def iter_review_docs(cleaned_dir=CLEANED_REVIEWS_DIR):
+    """Cleaned Play Store reviews, batch-cleaned and streamed; a review in both is indexed once."""
+    for app_name, review in _iter_cleaned_reviews(cleaned_dir):
+        yield {
+                "id": f"playstore:{review['review_id']}",
+                "source": "playstore",
+                "text": review.get('content') or '',
+                "app_name": app_name,
+                "score": review.get('score'),
+                "date": review.get('date'),
+            }
+
+def iter_reddit_docs(reddit_dir=REDDIT_DIR):
+    """Reddit posts and comments, as produced by extract_reddit_conversation."""
+    for file_path in sorted(Path(reddit_dir).glob('reddit_*.json')):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        conversations = data.get('conversations', []) if isinstance(data, dict) else data
+        for conversation in conversations:
+            post = conversation['post']
+            thread_id = conversation.get('thread_id')
+            yield {
+                "id": f"reddit:{thread_id}",
+                "source": "reddit",
+                "text": f"{post.get('title', '')} {post.get('text', '')}".strip(),
+                "subreddit": conversation.get('subreddit'),
+                "url": conversation.get('url'),
+            }
+            for i, comment in enumerate(conversation.get('comments', [])):
+                yield {
+                    "id": f"reddit:{thread_id}:{i}",
+                    "source": "reddit",
+                    "text": comment.get('text', ''),
+                    "subreddit": conversation.get('subreddit'),
+                    "url": comment.get('permalink') or conversation.get('url'),
+                }
+
+def iter_quora_docs(quora_file=QUORA_FILE):
+    """Quora question texts."""
+    if not os.path.exists(quora_file):
+        return
+    with open(quora_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    for keyword, discussions in data.get('discussions', {}).items():
+        for discussion in discussions:
+            yield {
+                "id": f"quora:{discussion.get('url')}",
+                "source": "quora",
+                "text": discussion.get('question', ''),
+                "keyword": keyword,
+                "url": discussion.get('url'),
+            }
+
+def iter_all_docs():
+    yield from iter_review_docs()
+    yield from iter_reddit_docs()
+    yield from iter_quora_docs()
+
+def sample_training_texts(docs, size=TRAIN_SAMPLE, seed=SEED):
+    """Texts to fit IDF and centroids on, sampled evenly across sources, and the document count.
+
+    Each source is reservoir-sampled, then the sample is split as evenly as
+    the sources allow, so the smaller Reddit and Quora corpora shape the
+    space as much as the Play Store reviews do.
+    """
+    rng = np.random.default_rng(seed)
+    reservoirs = {}
+    seen = {}
+    for doc in docs:
+        if not doc.get("text"):
+            continue
+        source = doc["source"]
+        reservoir = reservoirs.setdefault(source, [])
+        seen[source] = seen.get(source, 0) + 1
+        if len(reservoir) < size:
+            reservoir.append(doc["text"])
+        else:
+            j = int(rng.integers(seen[source]))
+            if j < size:
+                reservoir[j] = doc["text"]
+
+    texts = []
+    remaining = size
+    by_size = sorted(reservoirs.values(), key=len)
+    for i, reservoir in enumerate(by_size):
+        share = min(len(reservoir), remaining // (len(by_size) - i))
+        texts.extend(reservoir[:share])
+        remaining -= share
+    return texts, sum(seen.values())
+
+def build_index(path=INDEX_DIR, docs=None):
+    """Add every available document to the index at path, in batches.
+
+    A new index is first trained on a sample of every source, which takes
+    one extra pass over the documents.
+    """
+    index = SimilarityIndex(path)
+    if docs is not None:
+        docs = list(docs)  # Read twice when the index is new
+    if not index.trained:
+        texts, total = sample_training_texts(iter_all_docs() if docs is None else docs)
+        if texts:
+            print(f"Training on {len(texts)} of {total} documents...")
+            index.train(texts, expected_count=total)
+    docs = iter_all_docs() if docs is None else docs
+    added = 0
+    batch = []
+    for doc in docs:
+        batch.append(doc)
+        if len(batch) >= ADD_BATCH_SIZE:
+            added += index.add(batch)
+            batch = []
+    if batch:
+        added += index.add(batch)
+    if index.needs_retrain():
+        print(f"Retraining {len(index.centroids)} lists for {index.count} documents...")
+        index.retrain()
+    elif added:
+        index.save_inverted_lists()
+    if added:
+        nprobe = index.calibrate()
+        print(f"Calibrated nprobe={nprobe} of {len(index.centroids)} lists "
+              f"(recall@10 {index.meta['calibrated_recall']})")
+    print(f"Indexed {added} new documents ({index.count} total) in {path}")
+    return index
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Cross-source similarity search over reviews, Reddit and Quora.")
+    parser.add_argument('--index', default=INDEX_DIR, help="Index directory (default: %(default)s)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('build', help="Add every available document to the index")
+
+    query = subparsers.add_parser('query', help="Find documents similar to one or more texts")
+    query.add_argument('texts', nargs='*', help="Query texts (averaged); reads stdin lines if omitted")
+    query.add_argument('-k', type=int, default=10)
+    query.add_argument('--nprobe', type=int, help="Lists to scan (default: the calibrated value)")
+    query.add_argument('--source', choices=SOURCES, help="Only return documents from this source")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == 'build':
+        build_index(args.index)
+        return
+
+    texts = args.texts or [line.strip() for line in sys.stdin if line.strip()]
+    index = SimilarityIndex(args.index)
+    for result in index.search(texts, k=args.k, nprobe=args.nprobe, source=args.source):
+        print(json.dumps(result, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
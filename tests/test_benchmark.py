@@ -0,0 +1,50 @@
+import json
+
+import benchmark
+
+def result(throughput, p99, rss):
+    return {"throughput_per_s": throughput, "p99_ms": p99, "peak_rss_kb": rss}
+
+def test_compare_flags_regressions_and_unchecked_benchmarks():
+    baseline = {"benchmarks": {"clean_text": result(1000, 1.0, 10000)}}
+    results = {"clean_text": result(700, 1.1, 13000), "format_review": result(10, 1.0, 100)}
+    regressions, unchecked = benchmark.compare_to_baseline(results, baseline, 0.2)
+    assert len(regressions) == 2  # Throughput and peak RSS; p99 is inside the margin
+    assert unchecked == ["format_review"]
+
+def test_missing_baseline_is_an_error(tmp_path):
+    argv = ["--only", "nothing", "--output", str(tmp_path / "results.json"),
+            "--baseline", str(tmp_path / "baseline.json")]
+    assert benchmark.main(argv) == 2
+
+def test_committed_baseline_covers_every_default_benchmark():
+    with open(benchmark.BASELINE_FILE, encoding="utf-8") as f:
+        recorded = json.load(f)["benchmarks"]
+    expected = set(benchmark.BENCHMARKS)
+    expected |= {f"synthetic_clean_text_{scale}x" for scale in benchmark.SCALES}
+    assert expected <= set(recorded)
+
+def test_p99_needs_samples_and_an_absolute_slowdown():
+    baseline = {"benchmarks": {"format_review": result(1000, 0.02, 100)}}
+    jitter = dict(result(1000, 0.035, 100), samples=6000)  # +75%, but only 15µs
+    assert benchmark.compare_to_baseline({"format_review": jitter}, baseline, 0.2)[0] == []
+    few = dict(result(1000, 5.0, 100), samples=20)
+    assert benchmark.compare_to_baseline({"format_review": few}, baseline, 0.2)[0] == []
+    slow = dict(result(1000, 0.5, 100), samples=6000)
+    assert len(benchmark.compare_to_baseline({"format_review": slow}, baseline, 0.2)[0]) == 1
+
+def test_baseline_keeps_the_median_of_its_runs():
+    runs = [result(900, 2.0, 300), result(1100, 1.0, 100), result(1000, 1.5, 200)]
+    assert benchmark.median_result(runs) == dict(result(1000, 1.5, 200), runs=3)
+
+def test_a_regression_must_persist_across_reruns(monkeypatch):
+    baseline = {"benchmarks": {"clean_text": result(1000, 1.0, 100), "format_review": result(1000, 1.0, 100)}}
+    reruns = {"clean_text": iter([result(700, 1.0, 100), result(990, 1.0, 100)]),
+              "format_review": iter([result(700, 1.0, 100), result(650, 1.0, 100)])}
+    monkeypatch.setattr(benchmark, "run_isolated", lambda name, scale: next(reruns[name]))
+    results = {"clean_text": result(600, 1.0, 100), "format_review": result(600, 1.0, 100)}
+    plan = [("clean_text", None), ("format_review", None)]
+    benchmark.confirm_regressions(results, plan, baseline, 0.2)
+    assert results["clean_text"]["throughput_per_s"] == 990  # Noise: the second re-run passed
+    regressions, _ = benchmark.compare_to_baseline(results, baseline, 0.2)
+    assert regressions == ["format_review: throughput 600/s vs baseline 1000/s"]
@@ -0,0 +1,73 @@
+import json
+import re
+import unicodedata
+
+import emoji
+import pytest
+
+import clean_reviews
+from clean_reviews import clean_review, clean_review_batch, clean_text, clean_texts
+from lang_detect import detect_language, group_by_script
+
+def old_clean_text(text):
+    """clean_text as it was before script routing: one NFKD path for everything."""
+    text = emoji.replace_emoji(text, replace='')
+    text = unicodedata.normalize('NFKD', text)
+    text = re.sub(r'[^\w\s]', ' ', text)
+    return re.sub(r'\s+', ' ', text).strip().lower()
+
+ASCII_AND_LATIN = [
+    "Worst app ever!!! Refund not received :(",
+    "Tatkal booking failed, money deducted... 3 times",
+    "ok",
+    "Café service was très bien 👍👍",
+    "𝐁𝐞𝐬𝐭 𝐚𝐩𝐩 for train tickets",
+    "naïve UI — please fix the ﬁlters",
+    "Ｆｕｌｌ ｗｉｄｔｈ text and ① numbers",
+]
+
+@pytest.mark.parametrize("text", ASCII_AND_LATIN)
+def test_ascii_and_latin_output_is_unchanged(text):
+    assert clean_text(text) == old_clean_text(text)
+
+def test_devanagari_keeps_its_vowel_signs():
+    text = "मेरा टिकट कैंसिल हो गया, पैसे वापस नहीं आए। 😡"
+    cleaned = clean_text(text)
+    assert cleaned == "मेरा टिकट कैंसिल हो गया पैसे वापस नहीं आए"
+    # NFKD plus [^\w\s] used to split these words apart at their combining marks
+    assert old_clean_text(text) != cleaned
+    assert "ा" in cleaned and "ै" in cleaned
+
+@pytest.mark.parametrize("text, lang", [
+    ("मेरा टिकट कैंसिल हो गया", "hi"),
+    ("mera ticket cancel ho gaya aur paisa wapas nahi aaya", "hi-Latn"),
+    ("The refund was not processed after cancellation", "en"),
+    ("டிக்கெட் ரத்து செய்யப்பட்டது", "ta"),
+    ("👍👍 123", "und"),
+    ("", "und"),
+])
+def test_language_tags(text, lang):
+    assert detect_language(text) == lang
+    assert clean_review({"content": text})["lang"] == lang
+
+def test_batch_matches_one_review_at_a_time():
+    texts = ASCII_AND_LATIN + ["मेरा टिकट कैंसिल हो गया", "டிக்கெட் ரத்து", None, ""]
+    groups = group_by_script(texts)
+    assert {"ascii", "Latn", "Deva", "Taml"} <= set(groups)
+    assert sorted(i for indices in groups.values() for i in indices) == list(range(len(texts)))
+    assert clean_texts(texts) == [clean_text(text) for text in texts]
+
+    reviews = [{"review_id": str(i), "content": text, "title": text} for i, text in enumerate(texts)]
+    expected = [clean_review(dict(review)) for review in reviews]
+    assert clean_review_batch(reviews) == expected
+
+def test_process_reviews_file_cleans_in_batch(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    source = tmp_path / "reviews_irctc.json"
+    with open(source, 'w', encoding='utf-8') as f:
+        json.dump({"reviews": [{"content": "Refund not received!!"}, {"content": "पैसे वापस नहीं आए।"}]}, f)
+    assert clean_reviews.process_reviews_file(source)
+    with open(clean_reviews.get_cleaned_file(source), encoding='utf-8') as f:
+        reviews = json.load(f)["reviews"]
+    assert reviews == [{"content": "refund not received", "lang": "en"},
+                       {"content": "पैसे वापस नहीं आए", "lang": "hi"}]
@@ -0,0 +1,24 @@
+import pytest
+
+import cli
+
+@pytest.mark.parametrize("argv", [
+    ["scrape", "reddit", "--app", "IRCTC"],
+    ["scrape", "quora", "--since", "2025-03-01"],
+    ["scrape", "reddit", "--score", "1"],
+    ["scrape", "quora", "--fanout"],
+    ["scrape", "playstore", "--stream", "--fanout"],
+])
+def test_scrape_rejects_flags_that_would_be_ignored(argv, capsys):
+    with pytest.raises(SystemExit) as exc:
+        cli.parse_args(argv)
+    assert exc.value.code == 2
+    assert "--" in capsys.readouterr().err
+
+@pytest.mark.parametrize("argv", [
+    ["scrape", "reddit"],
+    ["scrape", "playstore", "--app", "IRCTC", "--fanout", "--since", "2025-03-01"],
+    ["scrape", "playstore", "--stream", "--score", "1"],
+])
+def test_scrape_accepts_flags_that_apply(argv):
+    assert cli.parse_args(argv).command == "scrape"
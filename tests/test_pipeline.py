@@ -0,0 +1,90 @@
+import errno
+import json
+import threading
+import uuid
+from datetime import datetime
+
+import pytest
+
+import pipeline
+import play_store
+
+def raw_batches(batches, per_batch=50):
+    for _ in range(batches):
+        yield [{
+            "reviewId": str(uuid.uuid4()),
+            "userName": "user",
+            "content": "Tatkal booking failed again!!",
+            "score": 1,
+            "thumbsUpCount": 0,
+            "reviewCreatedVersion": "4.1.0",
+            "at": datetime.now(),
+            "replyContent": None,
+        } for _ in range(per_batch)]
+
+@pytest.fixture
+def replay(monkeypatch, tmp_path):
+    monkeypatch.setattr(pipeline, "OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(play_store, "should_continue", True)
+
+    def use(batches):
+        monkeypatch.setattr(play_store, "iter_review_batches", lambda *args, **kwargs: raw_batches(batches))
+    return use
+
+class FailingWritePipeline(pipeline.StreamingPipeline):
+    """Writer that hits a full disk after a few batches while cleaned batches keep queueing."""
+
+    fail_after = 150
+
+    def write(self):
+        while True:
+            batch = self.clean_batches.get()
+            if batch is pipeline._DONE:
+                break
+            self.written += len(batch)
+            if self.written >= self.fail_after:
+                raise OSError(errno.ENOSPC, "No space left on device")
+
+def run_with_timeout(target, timeout=20):
+    outcome = {}
+
+    def call():
+        try:
+            outcome["result"] = target()
+        except Exception as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=call, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "pipeline hung"
+    return outcome
+
+def test_streams_target_and_resumes(replay):
+    replay(10)
+    assert pipeline.StreamingPipeline("IRCTC", "cris.org.in.prs.ima", target=120).run() == 120
+    with open(pipeline.get_stream_file("IRCTC"), encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert len(records) == 120
+    assert records[0]["content"] == "tatkal booking failed again"
+    # A second run already has the target stored
+    assert pipeline.StreamingPipeline("IRCTC", "cris.org.in.prs.ima", target=120).run() == 0
+
+def test_writer_failure_does_not_hang_and_is_raised(replay):
+    replay(40)
+    outcome = run_with_timeout(
+        FailingWritePipeline("IRCTC", "cris.org.in.prs.ima", target=2000, queue_size=1).run)
+    assert isinstance(outcome.get("error"), OSError)
+    assert outcome["error"].errno == errno.ENOSPC
+
+def test_writer_failure_after_done_does_not_hang(replay):
+    class FailOnClose(FailingWritePipeline):
+        fail_after = 10 ** 9
+
+        def write(self):
+            super().write()
+            raise OSError(errno.ENOSPC, "No space left on device")
+
+    replay(3)
+    outcome = run_with_timeout(FailOnClose("IRCTC", "cris.org.in.prs.ima", target=100, queue_size=1).run)
+    assert isinstance(outcome.get("error"), OSError)
@@ -0,0 +1,62 @@
+import json
+import threading
+from datetime import datetime
+
+import pytest
+
+google_play_scraper = pytest.importorskip("google_play_scraper")
+
+import play_store
+
+# More listings than the four threads fan-out used to be limited to
+SOURCES = [(lang, "in", sort) for lang in ("en", "hi", "ta") for sort in ("NEWEST", "MOST_RELEVANT")]
+SHARED = [f"shared-{i}" for i in range(10)]
+
+def raw_review(review_id):
+    return {
+        "reviewId": review_id,
+        "userName": "user",
+        "content": "Refund not received",
+        "score": 1,
+        "thumbsUpCount": 0,
+        "reviewCreatedVersion": "4.1.0",
+        "at": datetime.now(),
+        "replyContent": None,
+    }
+
+def own_ids(source):
+    return [f"{'-'.join(source)}-{i}" for i in range(5)]
+
+@pytest.fixture
+def listings(monkeypatch, tmp_path):
+    """Stub reviews(): every listing returns the shared reviews plus five of its own, once."""
+    # Each listing's first request waits here until all of them are in flight, so a
+    # fan-out with fewer threads than listings times out instead of merging
+    started = threading.Barrier(len(SOURCES), timeout=5)
+
+    def reviews(app_id, lang, country, sort, count, filter_score_with=None, continuation_token=None):
+        if continuation_token is not None:
+            return [], None
+        started.wait()
+        source = (lang, country, sort.name)
+        return [raw_review(review_id) for review_id in SHARED + own_ids(source)], "end"
+
+    monkeypatch.setattr(google_play_scraper, "reviews", reviews)
+    monkeypatch.setattr(google_play_scraper, "app", lambda app_id, **kwargs: {"title": "IRCTC"})
+    monkeypatch.setattr(play_store, "OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(play_store, "REQUEST_DELAY", 0)
+    monkeypatch.setattr(play_store, "RETRY_DELAY", 0)
+    monkeypatch.setattr(play_store, "should_continue", True)
+
+def test_fanout_merges_listings_once_with_their_source(listings):
+    play_store.scrape_app_reviews_fanout("IRCTC", "cris.org.in.prs.ima", SOURCES)
+    with open(play_store.get_output_file("IRCTC"), encoding="utf-8") as f:
+        reviews = json.load(f)["reviews"]
+
+    ids = [review["review_id"] for review in reviews]
+    assert len(ids) == len(set(ids)) == len(SHARED) + 5 * len(SOURCES)
+    listing = {review["review_id"]: tuple(review["source"].values()) for review in reviews}
+    for source in SOURCES:
+        assert all(listing[review_id] == source for review_id in own_ids(source))
+    # A review every listing returns is credited to whichever listing saw it first
+    assert {listing[review_id] for review_id in SHARED} <= set(SOURCES)
@@ -0,0 +1,54 @@
+import json
+from datetime import date
+
+import pytest
+
+import cli
+import play_store
+import work_queue
+from review_filters import ReviewFilter, filter_overrides
+from work_queue import WorkQueue
+
+@pytest.fixture
+def output_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(play_store, "OUTPUT_DIR", str(tmp_path))
+    return tmp_path
+
+def test_to_dict_round_trips_through_from_dict():
+    review_filter = ReviewFilter(start_date=date(2025, 3, 1), end_date=date(2025, 6, 30), scores=[2, 1])
+    config = review_filter.to_dict()
+    assert config == {"start_date": "2025-03-01", "end_date": "2025-06-30", "scores": [1, 2]}
+    assert ReviewFilter.from_dict(json.loads(json.dumps(config))).to_dict() == config
+
+def test_custom_filter_keeps_the_start_date_floor():
+    resolved = play_store.resolve_review_filter(ReviewFilter(scores=[1]))
+    assert resolved.start_date == play_store.START_DATE
+    assert resolved.scores == frozenset([1])
+
+def test_configured_filter_is_the_default(monkeypatch):
+    monkeypatch.setattr(play_store, "REVIEW_FILTER", {"min_thumbs_up": 5})
+    default = play_store.default_review_filter()
+    assert default.to_dict() == {"start_date": play_store.START_DATE.isoformat(), "min_thumbs_up": 5}
+
+def test_writer_records_the_filters_date_range(output_dir):
+    writer = play_store.ReviewFileWriter(
+        "IRCTC", ReviewFilter(start_date=date(2025, 3, 1), end_date=date(2025, 6, 30)))
+    writer.close()
+    with open(writer.output_file, encoding="utf-8") as f:
+        assert json.load(f)["date_range"] == {"start": "2025-03-01", "end": "2025-06-30"}
+
+def test_scrape_flags_become_filter_overrides():
+    args = cli.parse_args(["scrape", "playstore", "--since", "2025-03-01", "--score", "1", "--score", "2"])
+    assert filter_overrides(args) == {"start_date": date(2025, 3, 1), "scores": [1, 2]}
+    assert filter_overrides(cli.parse_args(["scrape", "playstore"])) == {}
+
+def test_seeded_jobs_carry_their_filter(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.db"))
+    work_queue.main(["--db", queue.path, "seed", "playstore", "--since", "2025-03-01", "--until", "2025-06-30"])
+    payloads = list(queue.iter_payloads("playstore"))
+    assert len(payloads) == len(play_store.APP_IDS)
+    assert {json.dumps(p["filter"], sort_keys=True) for p in payloads} == {
+        json.dumps({"start_date": "2025-03-01", "end_date": "2025-06-30"}, sort_keys=True)}
+    filters = work_queue.seeded_review_filters(queue)
+    assert filters["IRCTC"].start_date == date(2025, 3, 1)
+    assert filters["IRCTC"].end_date == date(2025, 6, 30)
@@ -0,0 +1,98 @@
+import json
+
+import numpy as np
+
+import similarity_index
+from similarity_index import SimilarityIndex, build_index, iter_review_docs, sample_training_texts
+
+WORDS = "refund cancel tatkal payment otp login crash slow delivery rider order wallet seat train".split()
+
+def make_docs(n_reviews=400, n_reddit=40, n_quora=20, seed=0):
+    rng = np.random.default_rng(seed)
+    docs = []
+    for source, n in (("playstore", n_reviews), ("reddit", n_reddit), ("quora", n_quora)):
+        for i in range(n):
+            words = rng.choice(WORDS, size=6)
+            if source != "playstore":
+                words = np.append(words, f"{source}only")
+            docs.append({"id": f"{source}:{i}", "source": source, "text": " ".join(words)})
+    return docs
+
+def make_topic_docs(n_topics=12, per_topic=150, seed=0):
+    """Reviews about distinct topics, each drawn from its own small vocabulary."""
+    rng = np.random.default_rng(seed)
+    docs = []
+    for topic in range(n_topics):
+        vocabulary = [f"t{topic}w{i}" for i in range(15)]
+        for i in range(per_topic):
+            text = " ".join(rng.choice(vocabulary, size=8))
+            docs.append({"id": f"playstore:{topic}:{i}", "source": "playstore", "text": text})
+    return docs
+
+def test_training_sample_is_balanced_across_sources():
+    texts, total = sample_training_texts(make_docs(), size=90)
+    assert total == 460
+    assert len(texts) == 90
+    # All of Quora's 20; its unused share is split between Reddit and the reviews
+    assert sum("quoraonly" in t for t in texts) == 20
+    assert sum("redditonly" in t for t in texts) == 35
+
+def test_build_trains_on_every_source(tmp_path, monkeypatch):
+    # A first add batch of reviews alone must not decide the space
+    monkeypatch.setattr(similarity_index, "ADD_BATCH_SIZE", 100)
+    index = build_index(tmp_path / "index", make_docs())
+    assert index.count == 460
+    bucket = similarity_index._feature("quoraonly")[0]
+    assert index.idf[bucket] < index.idf.max()
+    assert 1 <= index.meta["nprobe"] <= len(index.centroids)
+
+def test_inverted_lists_are_persisted_and_fall_back_after_add(tmp_path, monkeypatch):
+    build_index(tmp_path / "index", make_docs())
+    index = SimilarityIndex(tmp_path / "index")
+    expected_order, expected_starts = index._sort_lists()
+
+    def no_sort():
+        raise AssertionError("lists sorted at query time")
+
+    monkeypatch.setattr(index, "_sort_lists", no_sort)
+    order, starts = index._inverted_lists()
+    assert np.array_equal(order, expected_order) and np.array_equal(starts, expected_starts)
+
+    monkeypatch.undo()
+    index.add([{"id": "playstore:new", "source": "playstore", "text": "refund refund refund"}])
+    order, _ = index._inverted_lists()
+    assert len(order) == 461
+
+def test_retrain_refits_idf_and_reembeds(tmp_path):
+    index = SimilarityIndex(tmp_path / "index")
+    index.add(make_docs(n_reddit=0, n_quora=0))
+    index.add([{"id": f"reddit:x{i}", "source": "reddit", "text": "irctc server down again"} for i in range(300)])
+    old_idf = np.array(index.idf)
+    index.retrain()
+    assert not np.array_equal(old_idf, index.idf)
+    docs = list(index.iter_documents())
+    stored = np.asarray(index._mapped()["vectors"])
+    assert np.allclose(stored, index.embed([d["text"] for d in docs]), atol=1e-6)
+
+def test_streamed_reviews_are_indexed_once(tmp_path):
+    review = {"review_id": "r1", "content": "refund pending", "score": 1, "date": "2025-05-01"}
+    with open(tmp_path / "cleaned_reviews_irctc.json", 'w', encoding='utf-8') as f:
+        json.dump({"app_name": "IRCTC", "reviews": [review]}, f)
+    with open(tmp_path / "cleaned_reviews_irctc.jsonl", 'w', encoding='utf-8') as f:
+        f.write(json.dumps(review) + "\n")
+        f.write(json.dumps(dict(review, review_id="r2")) + "\n")
+
+    docs = list(iter_review_docs(tmp_path))
+    assert [(d["id"], d["app_name"]) for d in docs] == [
+        ("playstore:r1", "IRCTC"), ("playstore:r1", "IRCTC"), ("playstore:r2", "IRCTC")]
+    assert build_index(tmp_path / "index", docs).count == 2
+
+def test_calibrated_nprobe_scans_a_small_fraction_of_lists(tmp_path):
+    index = build_index(tmp_path / "index", make_topic_docs())
+    assert index.meta["calibrated_recall"] >= similarity_index.TARGET_RECALL
+    assert index.meta["nprobe"] <= len(index.centroids) // 4
+
+def test_texts_without_shared_features_are_not_similar(tmp_path):
+    index = build_index(tmp_path / "index", make_topic_docs())
+    first, second = index.embed(["t0w1 t0w2 t0w3", "t5w1 t5w2 t5w3"])
+    assert abs(float(first @ second)) < 0.2
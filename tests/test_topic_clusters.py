@@ -0,0 +1,54 @@
+import json
+
+import numpy as np
+
+import topic_clusters
+from similarity_index import _feature
+from topic_clusters import TopicModel, iter_cleaned_reviews
+
+def review(review_id, content="refund not received after cancellation", score=1):
+    return {"review_id": review_id, "content": content, "score": score}
+
+def test_streamed_stores_use_config_app_names(tmp_path):
+    with open(tmp_path / "cleaned_reviews_irctc.jsonl", 'w', encoding='utf-8') as f:
+        f.write(json.dumps(review("a")) + "\n")
+    with open(tmp_path / "cleaned_reviews_bookmyshow.jsonl", 'w', encoding='utf-8') as f:
+        f.write(json.dumps(review("b")) + "\n")
+    with open(tmp_path / "cleaned_reviews_irctc.json", 'w', encoding='utf-8') as f:
+        json.dump({"app_name": "IRCTC", "reviews": [review("c")]}, f)
+
+    apps = sorted(app_name for app_name, _ in iter_cleaned_reviews(tmp_path))
+    assert apps == ["BookMyShow", "IRCTC", "IRCTC"]
+
+def test_new_only_matches_a_set_across_buffer_merges(tmp_path, monkeypatch):
+    monkeypatch.setattr(topic_clusters, "SEEN_BUFFER_MIN", 50)
+    model = TopicModel(tmp_path / "state")
+    rng = np.random.default_rng(0)
+    expected = set()
+    for _ in range(40):
+        ids = [f"r{i}" for i in rng.integers(0, 2000, size=64)]
+        fresh = model._new_only([("IRCTC", review(i)) for i in ids])
+        fresh_ids = [r["review_id"] for _, r in fresh]
+        assert fresh_ids == [i for i in dict.fromkeys(ids) if i not in expected]
+        expected.update(ids)
+    assert len(model.seen) + len(model.seen_buffer) == len(expected)
+    assert len(model.seen_buffer) <= max(50, len(model.seen) // topic_clusters.SEEN_BUFFER_FRACTION)
+
+def test_new_model_is_fitted_across_every_input_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(topic_clusters, "BATCH_SIZE", 50)
+    # Sorted first, amazon's reviews would fill the whole first mini-batch
+    files = {"amazon_shopping": "parcel delivery late damaged box", "zomato": "cold biryani rider rude"}
+    for app, words in files.items():
+        reviews = [review(f"{app}{i}", " ".join(np.random.default_rng(i).permutation(words.split())))
+                   for i in range(200)]
+        with open(tmp_path / f"cleaned_reviews_{app}.json", 'w', encoding='utf-8') as f:
+            json.dump({"app_name": app, "reviews": reviews}, f)
+
+    topic_clusters.main(["--state", str(tmp_path / "state"), "update", "--input", str(tmp_path),
+                         "--topics", "2"])
+    model = TopicModel(tmp_path / "state")
+    # Zomato's vocabulary was seen when IDF was fitted
+    assert model.idf[_feature("biryani")[0]] < model.idf.max()
+    zomato_topics = [t for t in range(model.num_topics) if model.app_counts[t].get("zomato")]
+    amazon_topics = [t for t in range(model.num_topics) if model.app_counts[t].get("amazon_shopping")]
+    assert zomato_topics and amazon_topics and set(zomato_topics).isdisjoint(amazon_topics)
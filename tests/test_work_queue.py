@@ -0,0 +1,115 @@
+import sqlite3
+import threading
+
+import pytest
+
+import work_queue
+from work_queue import MAX_ATTEMPTS, WorkQueue
+
+@pytest.fixture
+def queue(tmp_path):
+    return WorkQueue(str(tmp_path / "queue.db"))
+
+def job_row(queue, key):
+    conn = sqlite3.connect(queue.path)
+    conn.row_factory = sqlite3.Row
+    try:
+        return conn.execute("SELECT * FROM jobs WHERE key = ?", (key,)).fetchone()
+    finally:
+        conn.close()
+
+def test_enqueue_is_idempotent(queue):
+    assert queue.enqueue("reddit", "reddit:india:IRCTC", {"subreddit": "india"})
+    assert not queue.enqueue("reddit", "reddit:india:IRCTC", {"subreddit": "india"})
+    assert queue.status()["jobs"] == {"reddit": {"pending": 1}}
+
+def test_live_lease_is_not_handed_out_twice(queue):
+    queue.enqueue("reddit", "a", {})
+    assert queue.lease("w1") is not None
+    assert queue.lease("w2") is None
+
+def test_expired_lease_is_reassigned(queue):
+    queue.enqueue("reddit", "a", {})
+    first = queue.lease("w1", lease_seconds=-1)
+    second = queue.lease("w2")
+    assert second.id == first.id
+    assert second.attempts == 2
+    assert job_row(queue, "a")["worker"] == "w2"
+    # The original worker can no longer renew the lease
+    assert not queue.heartbeat(first, "w1")
+    assert queue.heartbeat(second, "w2")
+
+def test_expired_leases_fail_after_max_attempts(queue):
+    queue.enqueue("reddit", "a", {})
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        job = queue.lease(f"w{attempt}", lease_seconds=-1)
+        assert job.attempts == attempt
+    assert queue.lease("late") is None
+    row = job_row(queue, "a")
+    assert row["status"] == "failed"
+    assert row["error"] == "lease expired"
+
+def test_fail_retries_until_max_attempts(queue):
+    queue.enqueue("reddit", "a", {})
+    for _ in range(MAX_ATTEMPTS - 1):
+        queue.fail(queue.lease("w1"), "w1", "HTTP 429")
+        assert job_row(queue, "a")["status"] == "pending"
+    queue.fail(queue.lease("w1"), "w1", "HTTP 429")
+    assert job_row(queue, "a")["status"] == "failed"
+    assert queue.lease("w1") is None
+
+def test_release_does_not_count_an_attempt(queue):
+    queue.enqueue("reddit", "a", {})
+    queue.release(queue.lease("w1"), "w1")
+    assert queue.lease("w1").attempts == 1
+
+def test_complete_after_lost_lease_stores_results_once(queue):
+    queue.enqueue("reddit", "a", {})
+    stale = queue.lease("w1", lease_seconds=-1)
+    current = queue.lease("w2")
+
+    # The stale worker's results are kept, but it cannot mark the job done
+    assert not queue.complete(stale, "w1", [("t1", "IRCTC", {"id": "t1"})])
+    assert job_row(queue, "a")["status"] == "leased"
+
+    assert queue.complete(current, "w2", [("t1", "IRCTC", {"id": "t1"}), ("t2", "IRCTC", {"id": "t2"})])
+    assert job_row(queue, "a")["status"] == "done"
+    assert list(queue.iter_results("reddit")) == [("IRCTC", {"id": "t1"}), ("IRCTC", {"id": "t2"})]
+
+@pytest.mark.parametrize("command", ["seed", "work", "export"])
+def test_kinds_default_to_all(command):
+    assert work_queue.parse_args([command]).kinds == []
+    assert work_queue.parse_args([command, "reddit", "quora"]).kinds == ["reddit", "quora"]
+
+def test_unknown_kind_is_rejected():
+    with pytest.raises(SystemExit):
+        work_queue.parse_args(["seed", "twitter"])
+
+@pytest.fixture
+def served(queue):
+    server = work_queue.make_server(queue, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+def test_remote_queue_round_trip(queue, served):
+    remote = work_queue.open_queue(served)
+    assert isinstance(remote, work_queue.RemoteWorkQueue)
+    assert remote.enqueue("reddit", "a", {"subreddit": "india"})
+    job = remote.lease("w1", ["reddit"])
+    assert (job.key, job.payload, job.attempts) == ("a", {"subreddit": "india"}, 1)
+    assert job_row(queue, "a")["worker"] == "w1"
+    assert remote.heartbeat(job, "w1")
+    assert remote.complete(job, "w1", [("t1", "IRCTC", {"id": "t1"})])
+    assert list(remote.iter_results("reddit")) == [("IRCTC", {"id": "t1"})]
+    assert list(remote.iter_payloads("reddit")) == [{"subreddit": "india"}]
+    assert remote.status() == queue.status()
+    assert remote.lease("w1") is None
+
+def test_served_queue_checks_the_token(queue, served, monkeypatch):
+    monkeypatch.setattr(work_queue, "QUEUE_TOKEN", "secret")
+    with pytest.raises(RuntimeError, match="token"):
+        work_queue.RemoteWorkQueue(served, token="wrong").status()
+    assert work_queue.RemoteWorkQueue(served).status() == queue.status()
@@ -0,0 +1,386 @@
+import os
+import json
+import math
+import zlib
+import heapq
+import argparse
+from pathlib import Path
+from datetime import datetime
+
+import numpy as np
+
+from similarity_index import STOPWORDS, TOKEN_RE, embed_texts, fit_idf
+
+# Configuration
+CLEANED_REVIEWS_DIR = "cleaned_reviews"
+STATE_DIR = "topic_state"
+REPORT_FILE = "topic_report.json"
+
+NUM_TOPICS = 30
+BATCH_SIZE = 2048  # Reviews per mini-batch update
+TRAIN_SAMPLE = 20000  # Reviews, sampled across every input file, that IDF and the topic seeds are fitted on
+COMPLAINT_MAX_SCORE = 2  # Only reviews rated at or below this are clustered; None for all
+REPRESENTATIVES = 5  # Reviews kept per topic, closest to its centroid
+LABEL_TERMS = 4  # Terms in a topic label
+MIN_LABEL_COUNT = 5  # A term must appear this often in a topic to label it
+MAX_TERMS_PER_TOPIC = 4000  # Term counters are pruned to half of this when they outgrow it
+MAX_GLOBAL_TERMS = 100000
+SEEN_BUFFER_MIN = 65536  # New review keys held apart from the main sorted set before a merge
+SEEN_BUFFER_FRACTION = 16  # ...or 1/this of the main set, whichever is larger
+SEED = 42
+
+# Contraction stems and fillers left behind by clean_text, which say nothing about a topic
+LABEL_STOPWORDS = STOPWORDS | frozenset("""
+don didn doesn isn wasn can won aren haven even also all any one get got been had more most
+""".split())
+
+# ---------------------------------------------------------------------------
+# Review input
+# ---------------------------------------------------------------------------
+
+def iter_cleaned_reviews(cleaned_dir=CLEANED_REVIEWS_DIR, max_score=COMPLAINT_MAX_SCORE):
+    """Yield (app_name, review) from cleaned JSON files and streamed JSON Lines stores."""
+    stream_names = None
+    for file_path in sorted(Path(cleaned_dir).glob('cleaned_reviews_*.json*')):
+        if file_path.suffix == '.jsonl':
+            if stream_names is None:
+                from pipeline import stream_app_names
+                stream_names = stream_app_names()
+            app_name = stream_names.get(file_path.name)
+            if app_name is None:
+                # A store for an app no longer in the config
+                app_name = file_path.stem.replace('cleaned_reviews_', '').replace('_', ' ').title()
+            with open(file_path, 'r', encoding='utf-8') as f:
+                reviews = (json.loads(line) for line in f if line.strip())
+                yield from _filter_reviews(app_name, reviews, max_score)
+        else:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            yield from _filter_reviews(data.get('app_name', file_path.stem), data.get('reviews', []), max_score)
+
+def _filter_reviews(app_name, reviews, max_score):
+    for review in reviews:
+        if not review.get('content'):
+            continue
+        if max_score is not None and (review.get('score') or 0) > max_score:
+            continue
+        yield app_name, review
+
+def review_key(review_id):
+    """64-bit key for the processed-review set (crc32 of the id in each half)."""
+    data = str(review_id).encode('utf-8')
+    return (zlib.crc32(data) << 32) | zlib.crc32(data[::-1])
+
+def _sorted_contains(sorted_keys, keys):
+    """Membership of keys in a sorted array by binary search, O(len(keys) log n)."""
+    if not len(sorted_keys):
+        return np.zeros(len(keys), dtype=bool)
+    index = np.searchsorted(sorted_keys, keys)
+    return sorted_keys[np.minimum(index, len(sorted_keys) - 1)] == keys
+
+def label_terms(text):
+    """Unigrams and bigrams used to label topics."""
+    tokens = [t for t in TOKEN_RE.findall(text)
+              if len(t) > 2 and t not in LABEL_STOPWORDS and not t.isdigit()]
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+def _prune(counter, limit):
+    """Keep the most frequent half of a counter once it grows past limit."""
+    if len(counter) > limit:
+        keep = heapq.nlargest(limit // 2, counter.items(), key=lambda item: item[1])
+        counter.clear()
+        counter.update(keep)
+
+# ---------------------------------------------------------------------------
+# Model
+# ---------------------------------------------------------------------------
+
+class TopicModel:
+    """Streaming complaint-topic model: mini-batch spherical k-means plus topic statistics.
+
+    Reviews are embedded with the hashed TF-IDF vectors from similarity_index and
+    folded into the centroids one mini-batch at a time (Sculley's per-centre
+    learning rate), so new reviews update the model without re-clustering.
+    Everything else kept per topic is bounded: pruned term counters for labels,
+    the few reviews nearest the centroid, and per-app / per-version counts.
+    Reviews already seen are remembered as sorted 64-bit keys so re-running over
+    the same files does not double count. New keys go to a small sorted buffer
+    that is merged into the main set only once it reaches a fraction of its
+    size, so each batch costs a binary search rather than a full-set rewrite.
+    """
+
+    def __init__(self, path=STATE_DIR, num_topics=NUM_TOPICS):
+        self.path = Path(path)
+        self.num_topics = num_topics
+        self.centroids = None
+        self.idf = None
+        self.center_counts = np.zeros(num_topics, dtype=np.int64)
+        self.seen = np.zeros(0, dtype=np.uint64)
+        self.seen_buffer = np.zeros(0, dtype=np.uint64)
+        self.topic_terms = [{} for _ in range(num_topics)]
+        self.global_terms = {}
+        self.representatives = [[] for _ in range(num_topics)]
+        self.app_counts = [{} for _ in range(num_topics)]
+        self.version_counts = [{} for _ in range(num_topics)]
+        self.rng = np.random.default_rng(SEED)
+        if (self.path / "state.json").exists():
+            self._load()
+
+    def _load(self):
+        self.centroids = np.load(self.path / "centroids.npy")
+        self.idf = np.load(self.path / "idf.npy")
+        self.center_counts = np.load(self.path / "center_counts.npy")
+        self.seen = np.fromfile(self.path / "seen.u64", dtype=np.uint64)
+        with open(self.path / "state.json", 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        self.num_topics = len(self.centroids)
+        self.topic_terms = state["topic_terms"]
+        self.global_terms = state["global_terms"]
+        self.representatives = [[tuple(r) for r in reps] for reps in state["representatives"]]
+        self.app_counts = state["app_counts"]
+        self.version_counts = state["version_counts"]
+
+    def save(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        np.save(self.path / "centroids.npy", self.centroids)
+        np.save(self.path / "idf.npy", self.idf)
+        np.save(self.path / "center_counts.npy", self.center_counts)
+        self._merge_seen()
+        self.seen.tofile(self.path / "seen.u64")
+        state = {
+            "updated_at": datetime.now().isoformat(),
+            "topic_terms": self.topic_terms,
+            "global_terms": self.global_terms,
+            "representatives": self.representatives,
+            "app_counts": self.app_counts,
+            "version_counts": self.version_counts,
+        }
+        partial = self.path / "state.json.partial"
+        with open(partial, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(partial, self.path / "state.json")
+
+    @property
+    def total(self):
+        return int(self.center_counts.sum())
+
+    def _merge_seen(self):
+        if len(self.seen_buffer):
+            self.seen = np.union1d(self.seen, self.seen_buffer)
+            self.seen_buffer = np.zeros(0, dtype=np.uint64)
+
+    def _new_only(self, batch):
+        keys = np.array([review_key(review.get('review_id')) for _, review in batch], dtype=np.uint64)
+        keys, first = np.unique(keys, return_index=True)
+        fresh = ~(_sorted_contains(self.seen, keys) | _sorted_contains(self.seen_buffer, keys))
+        self.seen_buffer = np.union1d(self.seen_buffer, keys[fresh])
+        if len(self.seen_buffer) > max(SEEN_BUFFER_MIN, len(self.seen) // SEEN_BUFFER_FRACTION):
+            self._merge_seen()
+        return [batch[i] for i in sorted(first[fresh])]
+
+    def train(self, texts):
+        """Fit IDF and seed the topics on a sample of review texts (see sample_review_texts)."""
+        self.idf = fit_idf(texts)
+        self._init_centroids(embed_texts(texts, self.idf))
+
+    def _init_centroids(self, vectors):
+        """k-means++ seeding."""
+        k = min(self.num_topics, len(vectors))
+        chosen = [int(self.rng.integers(len(vectors)))]
+        distances = 1 - vectors @ vectors[chosen[0]]
+        for _ in range(1, k):
+            weights = np.clip(distances, 0, None) ** 2
+            total = weights.sum()
+            index = int(self.rng.choice(len(vectors), p=weights / total)) if total else int(self.rng.integers(len(vectors)))
+            chosen.append(index)
+            distances = np.minimum(distances, 1 - vectors @ vectors[index])
+        self.centroids = vectors[chosen].copy()
+        self.num_topics = k
+        self.center_counts = np.zeros(k, dtype=np.int64)
+        del self.topic_terms[k:], self.representatives[k:], self.app_counts[k:], self.version_counts[k:]
+
+    def partial_fit(self, batch):
+        """Fold a batch of (app_name, review) pairs into the model. Returns reviews added.
+
+        A model that has not been trained is fitted on this first batch;
+        train_model fits a new model on a sample of all its input first.
+        """
+        batch = self._new_only(batch)
+        if not batch:
+            return 0
+        texts = [review['content'] for _, review in batch]
+        if self.idf is None:
+            self.idf = fit_idf(texts)
+        vectors = embed_texts(texts, self.idf)
+        if self.centroids is None:
+            self._init_centroids(vectors)
+
+        similarities = vectors @ self.centroids.T
+        assignments = np.argmax(similarities, axis=1)
+
+        # Mini-batch k-means update with a per-centre learning rate of 1 / count
+        for topic in np.unique(assignments):
+            members = vectors[assignments == topic]
+            self.center_counts[topic] += len(members)
+            rate = len(members) / self.center_counts[topic]
+            centroid = (1 - rate) * self.centroids[topic] + rate * members.mean(axis=0)
+            norm = np.linalg.norm(centroid)
+            self.centroids[topic] = centroid / norm if norm else self.centroids[topic]
+
+        for (app_name, review), topic, similarity in zip(batch, assignments, similarities.max(axis=1)):
+            self._record(int(topic), float(similarity), app_name, review)
+
+        for counter in self.topic_terms:
+            _prune(counter, MAX_TERMS_PER_TOPIC)
+        _prune(self.global_terms, MAX_GLOBAL_TERMS)
+        return len(batch)
+
+    def _record(self, topic, similarity, app_name, review):
+        terms = self.topic_terms[topic]
+        for term in set(label_terms(review['content'])):
+            terms[term] = terms.get(term, 0) + 1
+            self.global_terms[term] = self.global_terms.get(term, 0) + 1
+
+        apps = self.app_counts[topic]
+        apps[app_name] = apps.get(app_name, 0) + 1
+        version = f"{app_name} {review.get('review_created_version') or 'unknown'}"
+        versions = self.version_counts[topic]
+        versions[version] = versions.get(version, 0) + 1
+
+        representative = (round(similarity, 4), review.get('review_id'), app_name, review['content'][:300])
+        reps = self.representatives[topic]
+        if len(reps) < REPRESENTATIVES:
+            heapq.heappush(reps, representative)
+        elif representative[0] > reps[0][0]:
+            heapq.heapreplace(reps, representative)
+
+    def label(self, topic):
+        """Terms that are frequent in a topic and distinctive relative to all reviews."""
+        terms = self.topic_terms[topic]
+        topic_total = max(1, int(self.center_counts[topic]))
+        total = max(1, self.total)
+        scored = []
+        for term, count in terms.items():
+            if count < MIN_LABEL_COUNT:
+                continue
+            lift = (count / topic_total) / (self.global_terms.get(term, count) / total)
+            if lift > 1:
+                scored.append((count * math.log(lift), term))
+        return [term for _, term in heapq.nlargest(LABEL_TERMS, scored)]
+
+    def report(self, app_name=None, top=10):
+        """Topics ordered by size, optionally restricted to the counts of one app."""
+        topics = []
+        for topic in range(self.num_topics):
+            size = self.app_counts[topic].get(app_name, 0) if app_name else int(self.center_counts[topic])
+            if not size:
+                continue
+            reps = sorted(self.representatives[topic], reverse=True)
+            if app_name:
+                reps = [r for r in reps if r[2] == app_name] or reps
+            versions = self.version_counts[topic]
+            if app_name:
+                versions = {v: n for v, n in versions.items() if v.startswith(f"{app_name} ")}
+            topics.append({
+                "topic": topic,
+                "label": ", ".join(self.label(topic)),
+                "reviews": size,
+                "apps": dict(heapq.nlargest(top, self.app_counts[topic].items(), key=lambda item: item[1])),
+                "versions": dict(heapq.nlargest(top, versions.items(), key=lambda item: item[1])),
+                "representative_reviews": [
+                    {"review_id": review_id, "app_name": app, "similarity": similarity, "content": content}
+                    for similarity, review_id, app, content in reps
+                ],
+            })
+        topics.sort(key=lambda t: t["reviews"], reverse=True)
+        return topics
+
+def sample_review_texts(reviews, size=TRAIN_SAMPLE, seed=SEED):
+    """Reservoir sample of review texts, so every input file can shape IDF and the seeds."""
+    rng = np.random.default_rng(seed)
+    sample = []
+    for seen, (_, review) in enumerate(reviews, 1):
+        if len(sample) < size:
+            sample.append(review['content'])
+        else:
+            j = int(rng.integers(seen))
+            if j < size:
+                sample[j] = review['content']
+    return sample
+
+def train_model(model, reviews):
+    """Fit a new model on a sample of reviews; returns False if there were none.
+
+    Files are read in sorted order, so fitting on the first mini-batch would
+    let the first app or two decide the vocabulary weights and every seed.
+    """
+    texts = sample_review_texts(reviews)
+    if not texts:
+        return False
+    model.train(texts)
+    return True
+
+def update_model(model, reviews):
+    """Feed reviews through the model in mini-batches; returns how many were new."""
+    added = 0
+    batch = []
+    for item in reviews:
+        batch.append(item)
+        if len(batch) >= BATCH_SIZE:
+            added += model.partial_fit(batch)
+            batch = []
+    if batch:
+        added += model.partial_fit(batch)
+    return added
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Incremental complaint-topic clustering over cleaned reviews.")
+    parser.add_argument('--state', default=STATE_DIR, help="Model state directory (default: %(default)s)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    update = subparsers.add_parser('update', help="Fold new cleaned reviews into the model")
+    update.add_argument('--input', default=CLEANED_REVIEWS_DIR)
+    update.add_argument('--topics', type=int, default=NUM_TOPICS, help="Topic count for a new model")
+    update.add_argument('--max-score', type=int, default=COMPLAINT_MAX_SCORE,
+                        help="Only cluster reviews rated at or below this (default: %(default)s)")
+    update.add_argument('--all-scores', action='store_true', help="Cluster reviews of every rating")
+
+    report = subparsers.add_parser('report', help="Write the topic report")
+    report.add_argument('--app', help="Only count reviews of this app")
+    report.add_argument('--output', default=REPORT_FILE)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == 'update':
+        model = TopicModel(args.state, args.topics)
+        max_score = None if args.all_scores else args.max_score
+        if model.centroids is None:
+            # One extra pass over the input so the fit covers every file
+            train_model(model, iter_cleaned_reviews(args.input, max_score))
+        added = update_model(model, iter_cleaned_reviews(args.input, max_score))
+        if model.centroids is None:
+            print("No reviews to cluster")
+            return
+        model.save()
+        print(f"Added {added} new reviews; the model now covers {model.total} reviews in {model.num_topics} topics")
+        return
+
+    model = TopicModel(args.state)
+    if model.centroids is None:
+        print(f"No model in {args.state}; run the update command first")
+        return
+    data = {
+        "generated_at": datetime.now().isoformat(),
+        "app_name": args.app,
+        "total_reviews": model.total,
+        "topics": model.report(args.app),
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+    print(f"Saved {len(data['topics'])} topics to {args.output}")
+    for topic in data["topics"][:10]:
+        print(f"  {topic['reviews']:6d}  {topic['label']}")
+
+if __name__ == "__main__":
+    main()
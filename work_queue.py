@@ -0,0 +1,710 @@
+import json
+import os
+import time
+import uuid
+import socket
+import signal
+import sqlite3
+import argparse
+import threading
+import contextlib
+import urllib.error
+import urllib.request
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from review_filters import add_filter_arguments, filter_overrides
+
+# Configuration
+QUEUE_DB = "crawl_queue.db"  # Local disk of the queue host only; other machines connect through `serve`
+QUEUE_PORT = 8765  # Port `serve` listens on
+QUEUE_TOKEN = os.environ.get("WORK_QUEUE_TOKEN")  # Shared secret `serve` requires and clients send, if set
+REMOTE_RETRIES = 3  # Attempts per call to a served queue before a network error is raised
+LEASE_SECONDS = 300  # A job whose lease is not renewed within this window is handed to another worker
+HEARTBEAT_INTERVAL = 60  # How often a worker renews the lease on its current job
+MAX_ATTEMPTS = 3  # Leases per job before it is marked failed
+IDLE_WAIT = 10  # Seconds to wait before polling again when no job is available
+SQLITE_TIMEOUT = 30
+
+# Per-worker request budget for each source, in requests per minute
+RATE_LIMITS = {
+    "playstore": 60,
+    "reddit": 20,
+    "quora": 6,
+}
+
+# Where `export` writes merged results
+EXPORT_DIRS = {
+    "playstore": "playstore_reviews",
+    "reddit": "reddit_conversations",
+}
+QUORA_EXPORT_FILE = "quora_discussions.json"
+
+# Global flag for graceful shutdown
+should_continue = True
+
+def signal_handler(signum, frame):
+    """Handle interrupt signals gracefully."""
+    global should_continue
+    print("\nReceived interrupt signal. Finishing the current job and exiting gracefully...")
+    should_continue = False
+
+class LeaseLost(Exception):
+    """Raised inside a job when its lease has expired and another worker may own it."""
+
+class Job:
+    """A leased unit of crawl work."""
+
+    def __init__(self, job_id, kind, key, payload, attempts):
+        self.id = job_id
+        self.kind = kind
+        self.key = key
+        self.payload = payload
+        self.attempts = attempts
+
+    def __repr__(self):
+        return f"Job({self.kind}, {self.key!r}, attempt {self.attempts})"
+
+class WorkQueue:
+    """Crawl job queue with leases, backed by a SQLite file.
+
+    Every operation opens its own short-lived connection, so one WorkQueue can
+    be used from a worker's main and heartbeat threads at the same time, and
+    any number of processes on the same host can point at the same file.
+
+    The file must be on that host's local disk. The queue runs in WAL mode,
+    which keeps its index in shared memory, and SQLite's locking is unreliable
+    over NFS or SMB, so workers on other machines must not open it over a
+    network filesystem; run `serve` next to it and give them its URL
+    (RemoteWorkQueue) instead.
+    """
+
+    def __init__(self, path=QUEUE_DB):
+        self.path = path
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL UNIQUE,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    worker TEXT,
+                    lease_expires REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    updated_at REAL
+                );
+                CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, lease_expires);
+                CREATE TABLE IF NOT EXISTS results (
+                    kind TEXT NOT NULL,
+                    item_key TEXT NOT NULL,
+                    group_key TEXT NOT NULL,
+                    job_key TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (kind, item_key)
+                );
+            """)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=SQLITE_TIMEOUT, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextlib.contextmanager
+    def _connection(self):
+        conn = self._connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _transaction(self, conn):
+        # BEGIN IMMEDIATE takes the write lock up front so two workers can never lease the same job
+        conn.execute("BEGIN IMMEDIATE")
+
+    def enqueue(self, kind, key, payload):
+        """Add a job; enqueueing the same key again is a no-op. Returns True if it was new."""
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO jobs (kind, key, payload, updated_at) VALUES (?, ?, ?, ?)",
+                (kind, key, json.dumps(payload, ensure_ascii=False), time.time()))
+            return cursor.rowcount == 1
+
+    def lease(self, worker_id, kinds=None, lease_seconds=LEASE_SECONDS):
+        """Lease the next pending job, or one whose previous lease expired."""
+        now = time.time()
+        kind_filter = ""
+        params = [now, MAX_ATTEMPTS]
+        if kinds:
+            kind_filter = f"AND kind IN ({', '.join('?' for _ in kinds)})"
+            params.extend(kinds)
+
+        conn = self._connect()
+        try:
+            self._transaction(conn)
+            # Jobs whose workers died on their last allowed attempt will never be leased again
+            conn.execute("""
+                UPDATE jobs SET status = 'failed', worker = NULL, error = 'lease expired', updated_at = ?
+                WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?
+            """, (now, now, MAX_ATTEMPTS))
+            row = conn.execute(f"""
+                SELECT id, kind, key, payload, attempts FROM jobs
+                WHERE (status = 'pending' OR (status = 'leased' AND lease_expires < ?))
+                  AND attempts < ? {kind_filter}
+                ORDER BY attempts, id
+                LIMIT 1
+            """, params).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute("""
+                UPDATE jobs SET status = 'leased', worker = ?, lease_expires = ?,
+                                attempts = attempts + 1, updated_at = ?
+                WHERE id = ?
+            """, (worker_id, now + lease_seconds, now, row['id']))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return Job(row['id'], row['kind'], row['key'], json.loads(row['payload']), row['attempts'] + 1)
+
+    def heartbeat(self, job, worker_id, lease_seconds=LEASE_SECONDS):
+        """Extend a lease. Returns False if the worker no longer holds it."""
+        now = time.time()
+        with self._connection() as conn:
+            cursor = conn.execute("""
+                UPDATE jobs SET lease_expires = ?, updated_at = ?
+                WHERE id = ? AND worker = ? AND status = 'leased'
+            """, (now + lease_seconds, now, job.id, worker_id))
+            return cursor.rowcount == 1
+
+    def complete(self, job, worker_id, results):
+        """Store a job's results and mark it done.
+
+        results is an iterable of (item_key, group_key, data). Rows are merged
+        with INSERT OR IGNORE on (kind, item_key), so a job that is re-run after
+        a lost lease, or an item found by two jobs, is stored exactly once.
+        """
+        conn = self._connect()
+        try:
+            self._transaction(conn)
+            conn.executemany(
+                "INSERT OR IGNORE INTO results (kind, item_key, group_key, job_key, data) VALUES (?, ?, ?, ?, ?)",
+                ((job.kind, item_key, group_key, job.key, json.dumps(data, ensure_ascii=False))
+                 for item_key, group_key, data in results))
+            cursor = conn.execute("""
+                UPDATE jobs SET status = 'done', lease_expires = NULL, error = NULL, updated_at = ?
+                WHERE id = ? AND worker = ?
+            """, (time.time(), job.id, worker_id))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return cursor.rowcount == 1
+
+    def fail(self, job, worker_id, error):
+        """Release a job after an error; it is retried until MAX_ATTEMPTS, then marked failed."""
+        with self._connection() as conn:
+            conn.execute("""
+                UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                                worker = NULL, lease_expires = NULL, error = ?, updated_at = ?
+                WHERE id = ? AND worker = ?
+            """, (MAX_ATTEMPTS, str(error), time.time(), job.id, worker_id))
+
+    def release(self, job, worker_id):
+        """Hand a job back untouched, e.g. on shutdown, without counting the attempt."""
+        with self._connection() as conn:
+            conn.execute("""
+                UPDATE jobs SET status = 'pending', worker = NULL, lease_expires = NULL,
+                                attempts = attempts - 1, updated_at = ?
+                WHERE id = ? AND worker = ? AND status = 'leased'
+            """, (time.time(), job.id, worker_id))
+
+    def status(self):
+        """Job counts by kind and status, plus stored result counts by kind."""
+        with self._connection() as conn:
+            jobs = {}
+            for row in conn.execute("SELECT kind, status, COUNT(*) AS n FROM jobs GROUP BY kind, status"):
+                jobs.setdefault(row['kind'], {})[row['status']] = row['n']
+            results = {row['kind']: row['n'] for row in
+                       conn.execute("SELECT kind, COUNT(*) AS n FROM results GROUP BY kind")}
+        return {"jobs": jobs, "results": results}
+
+    def iter_payloads(self, kind):
+        """Yield the payload of every job of a kind, whatever its status."""
+        with self._connection() as conn:
+            for row in conn.execute("SELECT payload FROM jobs WHERE kind = ? ORDER BY id", (kind,)):
+                yield json.loads(row['payload'])
+
+    def iter_results(self, kind):
+        """Yield (group_key, data) for every stored result of a kind, grouped together."""
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT group_key, data FROM results WHERE kind = ? ORDER BY group_key, rowid", (kind,))
+            for row in rows:
+                yield row['group_key'], json.loads(row['data'])
+
+def job_to_dict(job):
+    return None if job is None else vars(job)
+
+def job_from_dict(data):
+    if data is None:
+        return None
+    return Job(data['id'], data['kind'], data['key'], data['payload'], data['attempts'])
+
+# Methods `serve` exposes, with how each one's result is sent back
+REMOTE_METHODS = {
+    "enqueue": lambda queue, kind, key, payload: queue.enqueue(kind, key, payload),
+    "lease": lambda queue, worker_id, kinds=None, lease_seconds=LEASE_SECONDS:
+        job_to_dict(queue.lease(worker_id, kinds, lease_seconds)),
+    "heartbeat": lambda queue, job, worker_id, lease_seconds=LEASE_SECONDS:
+        queue.heartbeat(job_from_dict(job), worker_id, lease_seconds),
+    "complete": lambda queue, job, worker_id, results: queue.complete(job_from_dict(job), worker_id, results),
+    "fail": lambda queue, job, worker_id, error: queue.fail(job_from_dict(job), worker_id, error),
+    "release": lambda queue, job, worker_id: queue.release(job_from_dict(job), worker_id),
+    "status": lambda queue: queue.status(),
+    "payloads": lambda queue, kind: list(queue.iter_payloads(kind)),
+    "results": lambda queue, kind: list(queue.iter_results(kind)),
+}
+
+class QueueRequestHandler(BaseHTTPRequestHandler):
+    """POST /<method> with a JSON object of arguments; replies {"result": ...} or {"error": ...}."""
+
+    def do_POST(self):
+        if QUEUE_TOKEN and self.headers.get('Authorization') != f"Bearer {QUEUE_TOKEN}":
+            return self._reply(401, {"error": "missing or wrong token"})
+        method = REMOTE_METHODS.get(self.path.strip('/'))
+        if method is None:
+            return self._reply(404, {"error": f"unknown method {self.path}"})
+        try:
+            params = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            result = method(self.server.queue, **params)
+        except Exception as e:
+            return self._reply(500, {"error": f"{type(e).__name__}: {str(e)}"})
+        self._reply(200, {"result": result})
+
+    def _reply(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # One line per heartbeat would drown the server's output
+
+def make_server(queue, host='127.0.0.1', port=QUEUE_PORT):
+    """HTTP server giving other machines access to a local WorkQueue."""
+    server = ThreadingHTTPServer((host, port), QueueRequestHandler)
+    server.queue = queue
+    return server
+
+class RemoteWorkQueue:
+    """WorkQueue client for a queue run by `serve` on another machine; same methods as WorkQueue."""
+
+    def __init__(self, url, token=None):
+        self.url = url.rstrip('/')
+        self.token = token or QUEUE_TOKEN
+
+    def _call(self, method, **params):
+        request = urllib.request.Request(
+            f"{self.url}/{method}", data=json.dumps(params, ensure_ascii=False).encode('utf-8'),
+            headers={'Content-Type': 'application/json'}, method='POST')
+        if self.token:
+            request.add_header('Authorization', f"Bearer {self.token}")
+        for attempt in range(1, REMOTE_RETRIES + 1):
+            try:
+                with urllib.request.urlopen(request, timeout=SQLITE_TIMEOUT + 10) as response:
+                    return json.loads(response.read())['result']
+            except urllib.error.HTTPError as e:
+                raise RuntimeError(f"Queue {method} failed: {json.loads(e.read()).get('error')}") from None
+            except urllib.error.URLError:
+                # A lease whose reply was lost just expires and goes to another worker
+                if attempt == REMOTE_RETRIES:
+                    raise
+                time.sleep(attempt)
+
+    def enqueue(self, kind, key, payload):
+        return self._call("enqueue", kind=kind, key=key, payload=payload)
+
+    def lease(self, worker_id, kinds=None, lease_seconds=LEASE_SECONDS):
+        return job_from_dict(self._call("lease", worker_id=worker_id, kinds=kinds, lease_seconds=lease_seconds))
+
+    def heartbeat(self, job, worker_id, lease_seconds=LEASE_SECONDS):
+        return self._call("heartbeat", job=job_to_dict(job), worker_id=worker_id, lease_seconds=lease_seconds)
+
+    def complete(self, job, worker_id, results):
+        return self._call("complete", job=job_to_dict(job), worker_id=worker_id, results=list(results))
+
+    def fail(self, job, worker_id, error):
+        self._call("fail", job=job_to_dict(job), worker_id=worker_id, error=str(error))
+
+    def release(self, job, worker_id):
+        self._call("release", job=job_to_dict(job), worker_id=worker_id)
+
+    def status(self):
+        return self._call("status")
+
+    def iter_payloads(self, kind):
+        yield from self._call("payloads", kind=kind)
+
+    def iter_results(self, kind):
+        for group_key, data in self._call("results", kind=kind):
+            yield group_key, data
+
+def open_queue(location=QUEUE_DB):
+    """A RemoteWorkQueue for an http(s) URL, otherwise a WorkQueue on a local SQLite file."""
+    if location.startswith(('http://', 'https://')):
+        return RemoteWorkQueue(location)
+    return WorkQueue(location)
+
+class RateLimiter:
+    """Spaces out calls so a worker stays inside its requests-per-minute budget."""
+
+    def __init__(self, requests_per_minute):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0
+        self.next_allowed = 0.0
+
+    def wait(self):
+        now = time.monotonic()
+        if now < self.next_allowed:
+            time.sleep(self.next_allowed - now)
+            now = self.next_allowed
+        self.next_allowed = now + self.interval
+
+class WorkContext:
+    """What a job handler gets: its rate budget and a way to notice a lost lease."""
+
+    def __init__(self, limiter, lost, worker):
+        self.limiter = limiter
+        self.lost = lost
+        self.worker = worker
+
+    def throttle(self):
+        """Call before every outbound request."""
+        if self.lost.is_set():
+            raise LeaseLost("lease expired; another worker may be running this job")
+        if not should_continue:
+            raise LeaseLost("worker is shutting down")
+        self.limiter.wait()
+
+# ---------------------------------------------------------------------------
+# Job handlers. Scraper modules are imported inside the handlers so a worker
+# only needs the dependencies of the kinds it runs.
+# ---------------------------------------------------------------------------
+
+def run_playstore_job(payload, ctx):
+    """One app listing: app + (lang, country, sort), filtered as it was seeded."""
+    import play_store
+    from review_filters import ReviewFilter
+
+    source = (payload['lang'], payload['country'], payload['sort'])
+    # Jobs seeded before filters were recorded carry none and get the worker's default
+    review_filter = ReviewFilter.from_dict(payload['filter']) if 'filter' in payload else None
+    batches = play_store.iter_review_batches(payload['app_name'], payload['app_id'], *source,
+                                             review_filter=review_filter)
+    results = {}
+    try:
+        while len(results) < play_store.TARGET_REVIEW_COUNT:
+            ctx.throttle()
+            batch = next(batches, None)
+            if batch is None:
+                break
+            for review in batch:
+                compact = play_store.compact_review(review)
+                if compact is None or compact.review_id in results:
+                    continue
+                compact.source = source
+                results[compact.review_id] = compact
+                if len(results) >= play_store.TARGET_REVIEW_COUNT:
+                    break
+    finally:
+        batches.close()
+    return [(review_id, payload['app_name'], compact.to_dict()) for review_id, compact in results.items()]
+
+def run_reddit_job(payload, ctx):
+    """One subreddit + search query."""
+    import reddit
+
+    ctx.throttle()
+    conversations = reddit.scrape_subreddit_conversations(
+        payload['subreddit'], payload['query'], wait=ctx.throttle) or []
+    results = []
+    for conversation in conversations:
+        if payload.get('category'):
+            conversation['category'] = payload['category']
+            conversation['keyword'] = payload['query']
+        # Keyed per group so a thread found for two apps lands in both of their files
+        results.append((f"{payload['group']}:{conversation['thread_id']}", payload['group'], conversation))
+    return results
+
+def run_quora_job(payload, ctx):
+    """One Quora search keyword. The browser is started once per worker and reused."""
+    import quora_scraper
+
+    if ctx.worker.driver is None:
+        ctx.worker.driver = quora_scraper.setup_driver()
+    ctx.throttle()
+    discussions = quora_scraper.scrape_keyword_discussions(ctx.worker.driver, payload['keyword'])
+    return [(d['url'], payload['keyword'], d) for d in discussions if d.get('url')]
+
+HANDLERS = {
+    "playstore": run_playstore_job,
+    "reddit": run_reddit_job,
+    "quora": run_quora_job,
+}
+
+class Worker:
+    """Leases jobs from a WorkQueue and runs them, renewing the lease while it works."""
+
+    def __init__(self, queue, worker_id=None, kinds=None, rate_limits=None):
+        self.queue = queue
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.kinds = kinds
+        limits = dict(RATE_LIMITS, **(rate_limits or {}))
+        self.limiters = {kind: RateLimiter(limits.get(kind)) for kind in HANDLERS}
+        self.driver = None
+
+    def _heartbeat(self, job, done, lost):
+        while not done.wait(HEARTBEAT_INTERVAL):
+            try:
+                if not self.queue.heartbeat(job, self.worker_id):
+                    lost.set()
+                    return
+            except Exception as e:
+                print(f"Heartbeat failed for {job}: {str(e)}")
+
+    def run_job(self, job):
+        done = threading.Event()
+        lost = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job, done, lost), daemon=True)
+        heartbeat.start()
+        ctx = WorkContext(self.limiters[job.kind], lost, self)
+        try:
+            results = HANDLERS[job.kind](job.payload, ctx)
+            done.set()
+            if self.queue.complete(job, self.worker_id, results):
+                print(f"Completed {job} with {len(results)} results")
+            else:
+                print(f"Stored results for {job}, but its lease had passed to another worker")
+        except LeaseLost as e:
+            done.set()
+            print(f"Stopped {job}: {str(e)}")
+            if not lost.is_set():
+                self.queue.release(job, self.worker_id)
+        except Exception as e:
+            done.set()
+            print(f"Error running {job}: {str(e)}")
+            self.queue.fail(job, self.worker_id, e)
+        finally:
+            heartbeat.join()
+
+    def run(self, once=False):
+        """Process jobs until the queue is drained (once=True) or the worker is stopped."""
+        print(f"Worker {self.worker_id} started")
+        try:
+            while should_continue:
+                job = self.queue.lease(self.worker_id, self.kinds)
+                if job is None:
+                    if once:
+                        break
+                    time.sleep(IDLE_WAIT)
+                    continue
+                print(f"\nLeased {job}")
+                self.run_job(job)
+        finally:
+            if self.driver is not None:
+                self.driver.quit()
+        print(f"Worker {self.worker_id} finished")
+
+# ---------------------------------------------------------------------------
+# Seeding and export
+# ---------------------------------------------------------------------------
+
+def seed_playstore_jobs(queue, fanout=False, review_filter=None):
+    """Enqueue one job per app listing; the filter (default: the configured one) travels in the payload."""
+    import play_store
+
+    sources = play_store.get_fanout_sources() if fanout else [play_store.DEFAULT_SOURCE]
+    criteria = play_store.resolve_review_filter(review_filter).to_dict()
+    # The default filter keeps the plain key; any other one is part of the job's identity
+    suffix = "" if review_filter is None else ":" + json.dumps(criteria, sort_keys=True)
+    added = 0
+    for app_name, app_id in play_store.APP_IDS.items():
+        for lang, country, sort in sources:
+            payload = {"app_name": app_name, "app_id": app_id, "lang": lang, "country": country, "sort": sort,
+                       "filter": criteria}
+            added += queue.enqueue("playstore", f"playstore:{app_id}:{lang}-{country}:{sort}{suffix}", payload)
+    return added
+
+def seed_reddit_jobs(queue):
+    import reddit
+
+    queries = [(app_name, app_name, None) for app_name in reddit.APPS]
+    queries += [(keyword, category, category) for category, keyword in reddit.KEYWORDS.items()]
+    added = 0
+    # SUBREDDITS has repeats; the unique job key collapses them
+    for subreddit in reddit.SUBREDDITS:
+        for query, group, category in queries:
+            payload = {"subreddit": subreddit, "query": query, "group": group, "category": category}
+            added += queue.enqueue("reddit", f"reddit:{subreddit.lower()}:{query}", payload)
+    return added
+
+def seed_quora_jobs(queue):
+    import quora_scraper
+
+    added = 0
+    for keyword in quora_scraper.SEARCH_KEYWORDS:
+        added += queue.enqueue("quora", f"quora:{keyword}", {"keyword": keyword})
+    return added
+
+SEEDERS = {
+    "playstore": seed_playstore_jobs,
+    "reddit": seed_reddit_jobs,
+    "quora": seed_quora_jobs,
+}
+
+def seeded_review_filters(queue):
+    """Per app, one ReviewFilter whose date range covers every filter its jobs were seeded with."""
+    import play_store
+    from review_filters import ReviewFilter
+
+    ranges = {}
+    for payload in queue.iter_payloads("playstore"):
+        review_filter = play_store.resolve_review_filter(
+            ReviewFilter.from_dict(payload['filter']) if 'filter' in payload else None)
+        ranges.setdefault(payload['app_name'], []).append(review_filter)
+    return {
+        app_name: ReviewFilter(
+            start_date=min(f.start_date for f in filters),
+            end_date=None if any(f.end_date is None for f in filters) else max(f.end_date for f in filters))
+        for app_name, filters in ranges.items()
+    }
+
+def export_playstore(queue):
+    import play_store
+
+    review_filters = seeded_review_filters(queue)
+    play_store.OUTPUT_DIR = EXPORT_DIRS["playstore"]
+    play_store.create_output_directory()
+    writer = None
+    for app_name, review in queue.iter_results("playstore"):
+        if writer is None or writer.app_name_key != app_name:
+            if writer is not None:
+                writer.close()
+                print(f"Saved {writer.count} reviews to {writer.output_file}")
+            writer = play_store.ReviewFileWriter(app_name, review_filters.get(app_name))
+        writer.write([review])
+    if writer is not None:
+        writer.close()
+        print(f"Saved {writer.count} reviews to {writer.output_file}")
+
+def export_reddit(queue):
+    os.makedirs(EXPORT_DIRS["reddit"], exist_ok=True)
+    grouped = {}
+    for group, conversation in queue.iter_results("reddit"):
+        grouped.setdefault(group, []).append(conversation)
+    for group, conversations in grouped.items():
+        output_file = os.path.join(EXPORT_DIRS["reddit"], f"reddit_{group.lower().replace(' ', '_')}.json")
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(conversations, f, indent=2, ensure_ascii=False)
+        print(f"Saved {len(conversations)} Reddit conversations to {output_file}")
+
+def export_quora(queue):
+    all_discussions = {}
+    for keyword, discussion in queue.iter_results("quora"):
+        all_discussions.setdefault(keyword, []).append(discussion)
+    data = {
+        "total_keywords": len(all_discussions),
+        "total_questions": sum(len(discussions) for discussions in all_discussions.values()),
+        "scraped_date": datetime.now().isoformat(),
+        "discussions": all_discussions
+    }
+    with open(QUORA_EXPORT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+    print(f"Saved {data['total_questions']} Quora questions to {QUORA_EXPORT_FILE}")
+
+EXPORTERS = {
+    "playstore": export_playstore,
+    "reddit": export_reddit,
+    "quora": export_quora,
+}
+
+def job_kind(value):
+    """argparse type for job kinds; `choices` would also reject an empty nargs='*' list."""
+    if value not in HANDLERS:
+        raise argparse.ArgumentTypeError(f"invalid kind {value!r} (choose from {', '.join(sorted(HANDLERS))})")
+    return value
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Shared crawl queue for running the scrapers on several machines.")
+    parser.add_argument('--db', default=QUEUE_DB,
+                        help="Queue database file on local disk, or the http:// URL of `serve` (default: %(default)s)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    seed = subparsers.add_parser('seed', help="Enqueue crawl jobs")
+    seed.add_argument('kinds', nargs='*', type=job_kind)
+    seed.add_argument('--fanout', action='store_true', help="Seed every Play Store locale/sort listing")
+    add_filter_arguments(seed)
+
+    work = subparsers.add_parser('work', help="Run a worker")
+    work.add_argument('kinds', nargs='*', type=job_kind)
+    work.add_argument('--worker-id')
+    work.add_argument('--once', action='store_true', help="Exit when no job is available")
+
+    subparsers.add_parser('status', help="Show job and result counts")
+
+    serve = subparsers.add_parser('serve', help="Serve the local queue file to workers on other machines")
+    serve.add_argument('--host', default='127.0.0.1',
+                       help="Address to listen on; use 0.0.0.0 on a trusted network (default: %(default)s)")
+    serve.add_argument('--port', type=int, default=QUEUE_PORT)
+
+    export = subparsers.add_parser('export', help="Write merged results to the usual output files")
+    export.add_argument('kinds', nargs='*', type=job_kind)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    queue = open_queue(args.db)
+
+    if args.command == 'seed':
+        for kind in args.kinds or sorted(HANDLERS):
+            if kind == 'playstore':
+                import play_store
+
+                overrides = filter_overrides(args)
+                review_filter = play_store.build_review_filter(overrides) if overrides else None
+                added = SEEDERS[kind](queue, args.fanout, review_filter)
+            else:
+                added = SEEDERS[kind](queue)
+            print(f"Enqueued {added} new {kind} jobs")
+    elif args.command == 'work':
+        signal.signal(signal.SIGINT, signal_handler)
+        signal.signal(signal.SIGTERM, signal_handler)
+        Worker(queue, args.worker_id, args.kinds or None).run(once=args.once)
+    elif args.command == 'status':
+        print(json.dumps(queue.status(), indent=4))
+    elif args.command == 'serve':
+        if isinstance(queue, RemoteWorkQueue):
+            raise SystemExit("serve needs a local queue file, not a URL")
+        server = make_server(queue, args.host, args.port)
+        print(f"Serving {args.db} on http://{args.host}:{server.server_port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    elif args.command == 'export':
+        for kind in args.kinds or sorted(HANDLERS):
+            EXPORTERS[kind](queue)
+
+if __name__ == "__main__":
+    main()